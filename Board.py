@@ -1,14 +1,40 @@
 #Board.py
 from patches import Patch
+from engine import JitSegment, is_jittable, Bank, is_bankable, ConstantFold, DirtyCheck, FeedbackGroup, strongly_connected, feedback_order, AudioEngine, Profiler
 from typing import List
+import numpy as np
 import json
+import time
+import wave
 
 class Board:
     sample_rate=22050
     blocksize=1024
+    engines=("python","numba")
+    # Delay inserted on the back-edge of a feedback loop: one "block" or one "sample"
+    feedback="block"
+    # With the python engine, this many instances of a class at one level run as a Bank
+    min_bank_size=4
+    # Skip pure patches fed by control-rate or constant patches in blocks where none of their inputs changed
+    dirty_tracking=True
+    # Control-rate patches are stepped once every control_period samples
+    control_period=64
+    interpolate_control=False
 
-    def __init__(self,patches:List=[]):
+    def __init__(self,patches:List=[],engine:str="python",backend="sounddevice"):
+        if engine not in self.engines: raise ValueError(f"Unknown engine {engine}, expected one of {self.engines}")
+        self.engine=engine
         self.patches=[]
+        self.time=0
+        self.plan=None
+        self.plan_blocksize=0
+        self.feedback_edges=[]
+        self.pruned=[]
+        self.folded=[]
+        self.bus=np.zeros((0,self.blocksize))
+        self.realtime_factor=None
+        self.audio_engine=AudioEngine(self,backend)
+        self.profiler=None
         for patch in patches: self.add_patch(patch)
 
     # In Board.py, modify the play method:
@@ -26,12 +52,296 @@ class Board:
             if hasattr(patch,"stop") and callable(getattr(patch,"stop")):
                 patch.stop()
 
+    def invalidate(self):
+        """Drop the compiled execution plan so it is rebuilt on the next block"""
+        self.plan=None
+
+    def compile(self,blocksize:int|None=None):
+        """Sort the patch graph topologically into a flat execution plan.
+
+        Patches that cannot reach a sink (AudioOutput, Scope, Printer and other
+        patches declaring "sink" in their metadata) are left out and listed in
+        self.pruned. Pure patches whose inputs are all unconnected or come from
+        other such patches are folded into constant rows, listed in self.folded
+        and only re-evaluated when one of their parameters changes. Pure patches
+        reading only control-rate, folded or such wrapped patches are wrapped in a
+        DirtyCheck that skips them while their inputs stay the same
+        (dirty_tracking). Audio-rate inputs change every block, comparing them
+        would only cost time.
+
+        Every output port gets a row of the preallocated self.bus array, and
+        connected inputs are aliases of the row of their source port, so a block
+        pass is a single loop over bound process_block methods reading and
+        writing rows in place. Unconnected inputs get a constant row of their own.
+
+        Feedback loops are found as strongly connected components. Inside each
+        one, the inputs reading a member placed later are the back-edges and
+        listed in self.feedback_edges. With feedback="block" they read the
+        previous block of their bus row and the loop runs in block mode like
+        the rest; with feedback="sample" the loop runs as a FeedbackGroup that
+        steps its members sample by sample with a one-sample delay.
+
+        Patches declaring control-rate outputs whose connected inputs all come
+        from control-rate outputs run through process_control_block. With
+        interpolate_control, audio-rate patches read their outputs through a
+        separate interpolated row, control-rate consumers still see held values.
+
+        With the python engine, instances of a class with a process_bank at the
+        same topological level are grouped into one struct-of-arrays Bank.
+        With the numba engine, consecutive jittable patches are fused into one
+        JitSegment kernel and the remaining patches keep their Python path."""
+        blocksize = blocksize or self.blocksize
+        jit = self.engine == "numba"
+        if jit and not JitSegment.available:
+            print("Warning: numba is not installed, falling back to the python engine")
+            jit = False
+        # Keep only what feeds a sink, walking the connections backwards
+        on_board = set(self.patches)
+        live = set()
+        stack = [patch for patch in self.patches if patch._sink]
+        while stack:
+            patch = stack.pop()
+            if patch in live or patch not in on_board: continue
+            live.add(patch)
+            stack += patch.inputs.values()
+        self.pruned = [patch for patch in self.patches if patch not in live]
+        patches = [patch for patch in self.patches if patch in live]
+        members = set(patches)
+        sources = {patch: [src for src in patch.inputs.values() if src in members] for patch in patches}
+
+        # Collapse every feedback loop into one node, ordered internally
+        nodes = []
+        node_of = {}
+        groups = {}
+        self.feedback_edges = []
+        for component in strongly_connected(patches, sources):
+            if len(component) > 1:
+                component, back_edges = feedback_order(component)
+                self.feedback_edges += back_edges
+                if self.feedback == "sample": groups[component[0]] = back_edges
+            for patch in component: node_of[patch] = len(nodes)
+            nodes.append(component)
+        for patch, name in self.feedback_edges:
+            print(f"Feedback loop: {type(patch).__name__}.{name} reads {type(patch.inputs[name]).__name__} delayed by one {self.feedback}")
+
+        consumers = [set() for _ in nodes]
+        pending = [set() for _ in nodes]
+        for patch in patches:
+            for src in sources[patch]:
+                if node_of[src] != node_of[patch]:
+                    consumers[node_of[src]].add(node_of[patch])
+                    pending[node_of[patch]].add(node_of[src])
+
+        # Kahn's algorithm, keeping board order among independent patches.
+        # For the numba engine prefer patches of the same kind as the last one,
+        # so jittable patches end up in as few segments as possible.
+        order = []
+        ready = [k for k in range(len(nodes)) if not pending[k]]
+        while ready:
+            i = 0
+            if jit and order:
+                kind = is_jittable(order[-1])
+                i = next((k for k, node in enumerate(ready) if is_jittable(nodes[node][0]) == kind), 0)
+            node = ready.pop(i)
+            order += nodes[node]
+            for consumer in sorted(consumers[node]):
+                pending[consumer].discard(node)
+                if not pending[consumer]: ready.append(consumer)
+
+        port_index = {}
+        for patch in order:
+            patch._output_ports = {}
+            for name in patch._io_outputs:
+                patch._output_ports[name] = port_index[(patch, name)] = len(port_index)
+        grouped = {patch for node in nodes if node[0] in groups for patch in node}
+        for patch in order:
+            patch._control_rate = False
+        for patch in order:
+            patch._input_ports = {}
+            control = patch not in grouped and bool(patch._io_outputs) and len(patch._control_outputs) == len(patch._io_outputs)
+            for name, src in patch.inputs.items():
+                if src in members:
+                    src_port = patch.getSourcePort(name)
+                    patch._input_ports[name] = port_index[(src, src_port)]
+                    control = control and src._control_rate and src_port in src._control_outputs
+            patch._control_rate = control
+        rows = len(port_index)
+        for patch in order:
+            patch._constant_ports = {}
+            for name in patch._io_inputs:
+                if name not in patch._input_ports:
+                    patch._constant_ports[name] = rows
+                    rows += 1
+
+        folded = set()
+        for patch in order:
+            if patch._pure and patch not in grouped and all(src in folded for src in sources[patch]):
+                folded.add(patch)
+        self.folded = [patch for patch in order if patch in folded]
+
+        # Interpolated control outputs keep their held values in their own row for
+        # control-rate consumers, audio-rate consumers read a ramped copy instead
+        for patch in order:
+            patch._ramp_ports = {}
+        if self.interpolate_control:
+            for patch in order:
+                if patch._control_rate: continue
+                for name, src in patch.inputs.items():
+                    if src not in members or not src._control_rate or src in folded: continue
+                    port = patch.getSourcePort(name)
+                    if port in src._trigger_outputs: continue
+                    if port not in src._ramp_ports:
+                        src._ramp_ports[port] = rows
+                        rows += 1
+                    patch._input_ports[name] = src._ramp_ports[port]
+        if self.pruned or self.folded:
+            print(f"Compiled board: pruned {len(self.pruned)} patch(es) not reaching a sink "
+                  f"{[type(p).__name__ for p in self.pruned]}, folded {len(self.folded)} constant patch(es) "
+                  f"{[type(p).__name__ for p in self.folded]}")
+        order = [patch for patch in order if patch not in folded]
+
+        # Steady sources only change at control ticks or on edits
+        dirty = set()
+        if self.dirty_tracking:
+            steady = set(folded)
+            for patch in order:
+                if patch._control_rate:
+                    steady.add(patch)
+                if patch._pure and patch not in grouped and all(src in steady for src in sources[patch]):
+                    dirty.add(patch)
+                    steady.add(patch)
+
+        self.bus = np.zeros((rows, blocksize))
+        self.plan_blocksize = blocksize
+        if not jit: order = self._bank(order, grouped, groups, nodes, node_of)
+        plan = [ConstantFold(self.folded, self).process_block] if self.folded else []
+        segment = []
+        for patch in order + [None]:
+            if not isinstance(patch, list) and patch in grouped and patch not in groups: continue
+            if jit and patch is not None and patch not in grouped and is_jittable(patch) and not patch._control_rate:
+                segment.append(patch)
+                continue
+            if segment:
+                plan.append(JitSegment(segment, self).process_block)
+                segment = []
+            if isinstance(patch, list):
+                plan.append(Bank(patch, self).process_block)
+            elif patch in groups:
+                group = nodes[node_of[patch]]
+                plan.append(FeedbackGroup(group, groups[patch], self).process_block)
+            elif patch is not None:
+                process = patch.process_control_block if patch._control_rate else patch.process_block
+                if patch in dirty: process = DirtyCheck(patch, process, self).process_block
+                plan.append(process)
+        self.plan = tuple(plan)
+        return self.plan
+
+    def _bank(self,order,grouped,groups,nodes,node_of):
+        """Reorder the plan by topological level, replacing every run of at least
+        min_bank_size bankable instances of one class on a level by a list of them"""
+        level = {}
+        for patch in order:
+            if patch in level: continue
+            # A sample-rate feedback loop is one unit, its internal edges don't count
+            members = nodes[node_of[patch]] if patch in grouped else [patch]
+            value = 0
+            for member in members:
+                for src in member.inputs.values():
+                    if src in level and src not in members: value = max(value, level[src] + 1)
+            for member in members: level[member] = value
+
+        levels = {}
+        for patch in order:
+            levels.setdefault(level[patch], []).append(patch)
+        banked = []
+        for value in sorted(levels):
+            kinds = {}
+            for patch in levels[value]:
+                if is_bankable(patch) and patch not in grouped and not patch._control_rate:
+                    kinds.setdefault(type(patch), []).append(patch)
+            banks = {members[0]: members for members in kinds.values() if len(members) >= self.min_bank_size}
+            skip = {patch for members in banks.values() for patch in members}
+            for patch in levels[value]:
+                if patch in banks: banked.append(banks[patch])
+                elif patch not in skip: banked.append(patch)
+        return banked
+
+    def process_block(self,n:int):
+        """Advance every patch in the board by n samples in a single block pass"""
+        if self.plan is None or n != self.plan_blocksize: self.compile(n)
+        if self.profiler is None:
+            for process in self.plan:
+                process(n)
+        else:
+            self.profiler.run(self.plan, n)
+        self.time += n
+
+    def enable_profiling(self,dump_path:str|None=None,dump_interval:float=10.0):
+        """Start recording per-patch and callback timings, optionally dumping them as JSON periodically"""
+        if self.profiler is None: self.profiler = Profiler(self)
+        if dump_path is not None: self.profiler.start_dump(dump_path, dump_interval)
+        return self.profiler
+
+    def disable_profiling(self):
+        if self.profiler is not None: self.profiler.stop_dump()
+        self.profiler = None
+
+    def render(self,duration:float,sample_rate:int|None=None,path:str|None=None):
+        """Render the board offline as fast as the CPU allows, without an audio device.
+
+        Returns a (frames, channels) float32 array with the same channel layout
+        as the audio engine, or streams 16-bit PCM to the WAV file at `path` and returns None. The achieved
+        realtime factor is printed and kept in self.realtime_factor. A different
+        sample_rate only applies to this render, the board's own is restored after it."""
+        engine = self.audio_engine
+        if not engine.route(): raise ValueError("Board has no AudioOutput to render")
+        previous_rate = self.sample_rate
+        if sample_rate is not None and sample_rate != self.sample_rate:
+            self.sample_rate = sample_rate
+            self.invalidate()
+        rate = self.sample_rate
+        frames = int(duration * rate)
+        n = self.blocksize
+
+        audio = None
+        wav = None
+        try:
+            if path is None:
+                audio = np.zeros((frames, engine.channels), dtype=np.float32)
+            else:
+                wav = wave.open(path, "wb")
+                wav.setnchannels(engine.channels)
+                wav.setsampwidth(2)
+                wav.setframerate(rate)
+            start = time.perf_counter()
+            for offset in range(0, frames, n):
+                # Always render whole blocks so the plan is not recompiled for the tail
+                block = engine.render(n)
+                count = min(n, frames - offset)
+                if wav is None:
+                    audio[offset:offset + count] = block[:count]
+                else:
+                    pcm = np.clip(block[:count], -1.0, 1.0) * 32767
+                    wav.writeframes(pcm.astype("<i2").tobytes())
+        finally:
+            if wav is not None: wav.close()
+            if self.sample_rate != previous_rate:
+                self.sample_rate = previous_rate
+                self.invalidate()
+        elapsed = time.perf_counter() - start
+
+        self.realtime_factor = (frames / rate) / elapsed if elapsed > 0 else float("inf")
+        print(f"Rendered {frames / rate:.2f}s in {elapsed:.2f}s ({self.realtime_factor:.1f}x realtime)")
+        return audio
+
     def add_patch(self,patch:Patch):
         self.patches.append(patch)
         patch.board=self
+        self.invalidate()
 
     def remove_patch(self,patch:Patch):
         self.patches.remove(patch)
+        self.invalidate()
         
     def handle_key(self, key: str):
         if key == 's':
@@ -51,17 +361,49 @@ class Board:
             position = patch_positions.get(patch) if patch_positions else None
             patch_data = patch.jsonify(patch_ids, position)
             serialized_patches.append(patch_data)
+
+        # Waveforms are serialized once and referenced by index from the patches.
+        # Identical FileWave definitions (the same file used by several players) share
+        # an entry unless the editor placed them as separate nodes. Other waveforms are
+        # only shared when they are the same object, FunctionWaves with the same source
+        # can still be different nodes
+        waveforms = []
+        waveform_ids = {}
+        definitions = {}
+        waveform_positions = waveform_positions or {}
+
+        def waveform_id(wave, data):
+            if wave not in waveform_ids:
+                if data.get("type") == "FileWave":
+                    definition = json.dumps([data, waveform_positions.get(wave)], sort_keys=True)
+                else:
+                    definition = id(wave)
+                if definition not in definitions:
+                    definitions[definition] = len(waveforms)
+                    waveforms.append(wave.jsonify(waveform_positions.get(wave)))
+                waveform_ids[wave] = definitions[definition]
+            return waveform_ids[wave]
+
+        for patch, patch_data in zip(self.patches, serialized_patches):
+            params = patch_data.get("params", {})
+            for name in patch._waveio_inputs:
+                if name in params:
+                    params[name] = {"ref": waveform_id(getattr(patch, name), params[name])}
+        # Waveforms placed in the editor but not used by any patch
+        for wave in waveform_positions:
+            waveform_id(wave, wave.jsonify())
         
         # Serialize the board itself
         result = {
             "sample_rate": self.sample_rate,
             "blocksize": self.blocksize,
-            "patches": serialized_patches
+            "engine": self.engine,
+            "feedback": self.feedback,
+            "control_period": self.control_period,
+            "interpolate_control": self.interpolate_control,
+            "patches": serialized_patches,
+            "waveforms": waveforms
         }
-        
-        # Add waveform positions if provided
-        if waveform_positions:
-            result["waveform_positions"] = waveform_positions
             
         return result
     
@@ -70,15 +412,41 @@ class Board:
         with open(filename, 'w') as f:
             json.dump(self.jsonify(patch_positions, waveform_positions), f, indent=2)
     
+    @staticmethod
+    def _load_waveform(data):
+        """Recreate a waveform from its jsonify() dict"""
+        wave_module = __import__('patches.waveforms', fromlist=[data["type"]])
+        wave_class = getattr(wave_module, data["type"])
+        
+        if data["type"] == "FileWave":
+            # Make sure filename exists in the data
+            if "filename" in data:
+                # Identical FileWaves share their decoded audio through the WaveformRegistry
+                return wave_class(data["filename"], data.get("sample_rate", 22050), streaming=data.get("streaming", False))
+            print(f"Warning: FileWave missing filename, using default")
+            return wave_class("default.wav")
+        elif data["type"] == "FunctionWave":
+            # Note: Function reconstruction from source is complex
+            # For now, we'll just create a default function
+            return wave_class(lambda x: x, data.get("duration", 1.0), data.get("sample_rate", 22050),
+                              prerender=data.get("prerender", False), resolution=data.get("resolution"))
+        return wave_class()
+
     @classmethod
     def load_from_file(cls, filename):
         """Load a board configuration from a JSON file"""
         with open(filename, 'r') as f:
             data = json.load(f)
         
-        # Extract positions correctly - they're stored within each patch
+        # Extract positions correctly - they're stored within each patch and waveform
         patch_positions = {}
-        waveform_positions = data.get("waveform_positions", {})
+        waveform_positions = {}
+        waveforms = []
+        for wave_data in data.get("waveforms", []):
+            wave = cls._load_waveform(wave_data)
+            waveforms.append(wave)
+            if "position" in wave_data:
+                waveform_positions[wave] = tuple(wave_data["position"])
         
         # Create patches first
         patches = []
@@ -92,26 +460,13 @@ class Board:
             # Create instance with parameters
             params = patch_data.get("params", {})
             
-            # Handle waveform parameters specially
+            # Waveform parameters are references into the shared "waveforms" list,
+            # older files have the waveform inline
             for param_name, param_value in params.items():
-                if isinstance(param_value, dict) and "type" in param_value:
-                    # This is a waveform parameter
-                    wave_module = __import__('patches.waveforms', fromlist=[param_value["type"]])
-                    wave_class = getattr(wave_module, param_value["type"])
-                    
-                    if param_value["type"] == "FileWave":
-                        # Make sure filename exists in the param_value
-                        if "filename" in param_value:
-                            params[param_name] = wave_class(param_value["filename"])
-                        else:
-                            print(f"Warning: FileWave missing filename, using default")
-                            params[param_name] = wave_class("default.wav")
-                    elif param_value["type"] == "FunctionWave":
-                        # Note: Function reconstruction from source is complex
-                        # For now, we'll just create a default function
-                        params[param_name] = wave_class(lambda x: x)
-                    else:
-                        params[param_name] = wave_class()
+                if isinstance(param_value, dict) and "ref" in param_value:
+                    params[param_name] = waveforms[param_value["ref"]]
+                elif isinstance(param_value, dict) and "type" in param_value:
+                    params[param_name] = cls._load_waveform(param_value)
             
             patch = patch_class(**params)
             patches.append(patch)
@@ -122,9 +477,12 @@ class Board:
                 patch_positions[patch] = tuple(patch_data["position"])
         
         # Create board
-        board = cls(patches)
+        board = cls(patches, engine=data.get("engine", "python"))
         board.sample_rate = data.get("sample_rate", cls.sample_rate)
         board.blocksize = data.get("blocksize", cls.blocksize)
+        board.feedback = data.get("feedback", cls.feedback)
+        board.control_period = data.get("control_period", cls.control_period)
+        board.interpolate_control = data.get("interpolate_control", cls.interpolate_control)
         
         # Restore connections
         for i, patch_data in enumerate(data["patches"]):
@@ -139,15 +497,5 @@ class Board:
         # CRITICAL FIX: Ensure all patches have the correct board reference
         for patch in board.patches:
             patch.board = board
-            
-        # FIX: Reinitialize AudioOutput streams if they exist
-        for patch in board.patches:
-            if hasattr(patch, 'stream') and patch.stream is not None:
-                # Stop and clean up any existing stream
-                try:
-                    patch.stop()
-                except:
-                    pass
-                patch.stream = None
         
         return board, patch_positions, waveform_positions
\ No newline at end of file
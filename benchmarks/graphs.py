@@ -0,0 +1,91 @@
+#benchmarks/graphs.py
+"""Synthetic boards of configurable size for the benchmark suite."""
+from patches import Patch, SineGenerator, Filter, VCA, ThreeMix, AudioOutput
+from Board import Board
+
+
+def _mix(board, sources):
+    """Sum (patch, output name) pairs with a tree of ThreeMix patches and return the root"""
+    while len(sources) > 1:
+        mixed = []
+        for i in range(0, len(sources), 3):
+            mix = ThreeMix()
+            board.add_patch(mix)
+            for k, (patch, name) in enumerate(sources[i:i + 3]):
+                Patch.connect(mix, patch, f"in{k + 1}", name)
+            mixed.append((mix, "output"))
+        sources = mixed
+    return sources[0]
+
+
+def _output(board, source):
+    out = AudioOutput()
+    board.add_patch(out)
+    Patch.connect(out, source[0], "input", source[1])
+    return board
+
+
+def chain(size: int, engine: str = "python"):
+    """One oscillator through `size` alternating Filter and VCA stages"""
+    board = Board(engine=engine)
+    sine = SineGenerator(frequency=220)
+    board.add_patch(sine)
+    last = (sine, "output")
+    for i in range(size):
+        stage = Filter(cutoff=2000) if i % 2 == 0 else VCA(amplification=0.9)
+        board.add_patch(stage)
+        Patch.connect(stage, last[0], "input", last[1])
+        last = (stage, "low_pass" if isinstance(stage, Filter) else "output")
+    return _output(board, last)
+
+
+def fanout(size: int, engine: str = "python"):
+    """One oscillator feeding `size` VCAs that are mixed back together"""
+    board = Board(engine=engine)
+    sine = SineGenerator(frequency=220)
+    board.add_patch(sine)
+    vcas = []
+    for i in range(size):
+        vca = VCA(amplification=1.0 / size)
+        board.add_patch(vca)
+        Patch.connect(vca, sine, "input", "output")
+        vcas.append((vca, "output"))
+    return _output(board, _mix(board, vcas))
+
+
+def filter_cascade(size: int, engine: str = "python"):
+    """One oscillator through `size` Filters in series"""
+    board = Board(engine=engine)
+    sine = SineGenerator(frequency=220)
+    board.add_patch(sine)
+    last = (sine, "output")
+    for i in range(size):
+        filt = Filter(cutoff=500 + 100 * i, resonance=0.3)
+        board.add_patch(filt)
+        Patch.connect(filt, last[0], "input", last[1])
+        last = (filt, "low_pass")
+    return _output(board, last)
+
+
+def voices(size: int, engine: str = "python"):
+    """`size` SineGenerator -> Filter -> VCA voices mixed with ThreeMix"""
+    board = Board(engine=engine)
+    outputs = []
+    for i in range(size):
+        sine = SineGenerator(frequency=110 * (i + 1), amplitude=0.5)
+        filt = Filter(cutoff=1000 + 50 * i)
+        vca = VCA(amplification=1.0 / size)
+        for patch in (sine, filt, vca):
+            board.add_patch(patch)
+        Patch.connect(filt, sine, "input", "output")
+        Patch.connect(vca, filt, "input", "low_pass")
+        outputs.append((vca, "output"))
+    return _output(board, _mix(board, outputs))
+
+
+GRAPHS = {
+    "chain": chain,
+    "fanout": fanout,
+    "filter_cascade": filter_cascade,
+    "voices": voices
+}
@@ -0,0 +1,89 @@
+#benchmarks/invariants.py
+"""Check that every patch is evaluated exactly once per sample.
+
+Run from the repository root:
+
+    python -m benchmarks.invariants
+
+Patches running through the per-sample adapter must see exactly one step()
+call per sample, however many consumers read their outputs, and every patch
+must advance its time by exactly one block per block. In total the board does
+patches x samples steps, not counting pruned patches."""
+import contextlib
+import io
+from patches import Patch, CountTo, WalkingNoise, EveryN, VCA
+from Board import Board
+from benchmarks.graphs import GRAPHS, _mix, _output
+
+
+def step_fanout(size: int, engine: str = "python"):
+    """Patches without a process_block (WalkingNoise, EveryN and CountTo with the
+    python engine) each feeding `size` VCAs, so their step() calls are counted"""
+    board = Board(engine=engine)
+    noise = WalkingNoise()
+    counter = CountTo(limit=8)
+    every = EveryN(n=3)
+    for patch in (noise, counter, every):
+        board.add_patch(patch)
+    Patch.connect(every, counter, "input", "output")
+    vcas = []
+    for i in range(size):
+        vca = VCA()
+        board.add_patch(vca)
+        Patch.connect(vca, counter if i % 2 == 0 else every, "input", "output")
+        Patch.connect(vca, noise, "amplification", "output")
+        vcas.append((vca, "output"))
+    return _output(board, _mix(board, vcas))
+
+
+GRAPHS = dict(GRAPHS, step_fanout=step_fanout)
+
+
+def count_steps(board, blocks: int = 4):
+    """Render `blocks` blocks and return (steps, expected), where steps sums the
+    samples every patch advanced and expected is patches x samples"""
+    calls = {}
+
+    def counting(patch, step):
+        def wrapper():
+            calls[patch] = calls.get(patch, 0) + 1
+            step()
+        return wrapper
+
+    for patch in board.patches:
+        patch.step = counting(patch, patch.step)
+    try:
+        start = {patch: patch.time for patch in board.patches}
+        n = board.blocksize
+        for _ in range(blocks):
+            board.process_block(n)
+    finally:
+        for patch in board.patches:
+            del patch.step
+
+    samples = blocks * n
+    steps = 0
+    # Patches that cannot reach a sink are not evaluated at all
+    live = [patch for patch in board.patches if patch not in board.pruned]
+    for patch in live:
+        advanced = patch.time - start[patch]
+        # Patches with a native process_block never call step()
+        if patch in calls and not patch._control_rate and calls[patch] != samples:
+            raise AssertionError(f"{type(patch).__name__} stepped {calls[patch]} times for {samples} samples")
+        if advanced != samples:
+            raise AssertionError(f"{type(patch).__name__} advanced {advanced} samples instead of {samples}")
+        steps += advanced
+    return steps, len(live) * samples
+
+
+def main():
+    for name, build in GRAPHS.items():
+        for engine in ("python", "numba"):
+            with contextlib.redirect_stdout(io.StringIO()):
+                board = build(16, engine)
+            steps, expected = count_steps(board)
+            print(f"{name:>15} {engine:>6}  {steps} steps, expected {expected}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#benchmarks/run.py
+"""Headless benchmark of the block engine across graph shapes and sizes.
+
+Run from the repository root:
+
+    python -m benchmarks.run --seconds 5 --out bench.json
+    python -m benchmarks.run --compare bench.json
+
+Every board is rendered block by block without an audio device, and the
+results are written as JSON so runs of different versions can be compared."""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+import numpy as np
+from benchmarks.graphs import GRAPHS
+
+SIZES = (4, 16, 64)
+
+
+def measure(graph: str, size: int, engine: str, seconds: float):
+    with contextlib.redirect_stdout(io.StringIO()):
+        board = GRAPHS[graph](size, engine)
+        render_block = board.audio_engine.render
+        board.audio_engine.route()
+        n = board.blocksize
+        blocks = max(1, int(seconds * board.sample_rate / n))
+        # The first block compiles the plan (and numba kernels), keep it out of the timings
+        render_block(n)
+
+        latencies = np.zeros(blocks)
+        clock = time.perf_counter
+        start = clock()
+        for i in range(blocks):
+            t0 = clock()
+            render_block(n)
+            latencies[i] = clock() - t0
+        elapsed = clock() - start
+
+        # Separate pass for memory on a fresh board, since tracemalloc slows everything
+        # down. Tracing starts before the board is built so the bus, the patches and
+        # any decoded audio count; numba kernels are cached from the timed pass
+        tracemalloc.start()
+        traced = GRAPHS[graph](size, engine)
+        traced.audio_engine.route()
+        for _ in range(min(blocks, 8) + 1):
+            traced.audio_engine.render(n)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        del traced
+
+    samples = blocks * n
+    deadline = n / board.sample_rate
+    return {
+        "graph": graph,
+        "size": size,
+        "engine": engine,
+        "patches": len(board.patches),
+        "blocksize": n,
+        "samples_per_sec": samples / elapsed,
+        "realtime_factor": (samples / board.sample_rate) / elapsed,
+        "block_p50_ms": 1e3 * float(np.percentile(latencies, 50)),
+        "block_p99_ms": 1e3 * float(np.percentile(latencies, 99)),
+        "deadline_ms": 1e3 * deadline,
+        "peak_memory_kb": peak / 1024
+    }
+
+
+def _version():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline):
+    """Print the realtime factor of each case relative to a previous run"""
+    previous = {(r["graph"], r["size"], r["engine"]): r for r in baseline["results"]}
+    print(f"Compared with {baseline.get('version')}:")
+    for r in results:
+        old = previous.get((r["graph"], r["size"], r["engine"]))
+        if old is not None:
+            ratio = r["realtime_factor"] / old["realtime_factor"]
+            print(f"  {r['graph']:>15} {r['size']:>4} {r['engine']:>6}  {ratio:6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=2.0, help="audio seconds rendered per case")
+    parser.add_argument("--graphs", nargs="+", default=list(GRAPHS), choices=list(GRAPHS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES))
+    parser.add_argument("--engines", nargs="+", default=["python"], choices=["python", "numba"])
+    parser.add_argument("--out", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON file of a previous run to compare against")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'graph':>15} {'size':>4} {'engine':>6} {'patches':>7} {'x realtime':>10} {'p50 ms':>7} {'p99 ms':>7} {'peak kB':>8}")
+    for graph in args.graphs:
+        for size in args.sizes:
+            for engine in args.engines:
+                r = measure(graph, size, engine, args.seconds)
+                results.append(r)
+                print(f"{graph:>15} {size:>4} {engine:>6} {r['patches']:>7} {r['realtime_factor']:>10.1f} "
+                      f"{r['block_p50_ms']:>7.2f} {r['block_p99_ms']:>7.2f} {r['peak_memory_kb']:>8.0f}")
+
+    report = {
+        "version": _version(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "seconds": args.seconds,
+        "results": results
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#engine/AudioEngine.py
+import numpy as np
+import threading
+import time as systime
+from math import ceil
+from .RingBuffer import RingBuffer
+from .backends import AudioBackend, BACKENDS
+
+
+class AudioEngine:
+    """Owns the single output stream of a board, opened through an AudioBackend.
+
+    Every callback runs the board graph exactly once and routes each AudioOutput
+    to a channel of a multichannel stream. AudioOutputs sharing a `bus` name are
+    mixed into the same channel, the others each get their own channel.
+
+    If any AudioOutput is threaded, a render thread keeps a ring buffer `latency`
+    seconds ahead of the stream and the callback only copies from it."""
+
+    def __init__(self, board, backend: str | AudioBackend = "sounddevice"):
+        self.board = board
+        self.backend = BACKENDS[backend]() if isinstance(backend, str) else backend
+        self.ring = None
+        self.render_thread = None
+        self.running = False
+        self.routes = []
+        self.playing = []    # routes whose AudioOutput is still on the board
+        self.routed_plan = None
+        self.channels = 0
+        self.blocksize = board.blocksize
+        self.block = np.zeros((self.blocksize, 1), dtype=np.float32)
+        self.underruns = 0
+        self.min_fill_level = 0
+        self.log_time = False
+        self.log_interval = 30.0
+        self.last_log = 0.0
+        self.num_callbacks = 0
+
+    @property
+    def fill_level(self):
+        """Frames currently buffered ahead of the stream in threaded mode"""
+        return self.ring.fill if self.ring is not None else 0
+
+    def route(self):
+        """Assign every AudioOutput of the board to a stream channel"""
+        from patches import AudioOutput
+        buses = {}
+        self.routes = []
+        for patch in self.board.patches:
+            if isinstance(patch, AudioOutput):
+                key = patch.bus if patch.bus is not None else patch
+                if key not in buses: buses[key] = len(buses)
+                self.routes.append((patch, buses[key]))
+        self.channels = len(buses)
+        self.playing = list(self.routes)
+        self.routed_plan = None
+        return self.routes
+
+    def render(self, frames: int):
+        """Run the board once for `frames` samples and mix the outputs into self.block"""
+        self.board.process_block(frames)
+        if self.board.plan is not self.routed_plan:
+            # The board was edited, an AudioOutput removed while the stream runs
+            # must not keep adding its last buffer, its channel stays silent
+            on_board = set(self.board.patches)
+            self.playing = [(output, channel) for output, channel in self.routes if output in on_board]
+            self.routed_plan = self.board.plan
+        if self.block.shape != (frames, self.channels):
+            self.block = np.zeros((frames, self.channels), dtype=np.float32)
+        else:
+            self.block.fill(0.0)
+        for output, channel in self.playing:
+            self.block[:, channel] += output.buffer
+        return self.block
+
+    def audio_callback(self, outdata, frames, time, status):
+        profiler = self.board.profiler
+        if profiler is not None: profiler.begin_callback()
+        self._callback(outdata, frames, time, status)
+        if profiler is not None: profiler.end_callback(frames, status)
+
+    def _callback(self, outdata, frames, time, status):
+        if self.log_time and (time.currentTime - self.last_log) >= self.log_interval:
+            print(self.num_callbacks / (time.currentTime - self.last_log))
+            self.last_log = time.currentTime
+            self.num_callbacks = 0
+        self.num_callbacks += 1
+        if status:
+            print(f"Status: {status}")
+
+        if self.ring is not None:
+            # The render thread already produced these samples, just copy them out
+            self.min_fill_level = min(self.min_fill_level, self.ring.fill)
+            read = self.ring.read(outdata)
+            if read < frames:
+                outdata[read:] = 0.0
+                self.underruns += 1
+            return
+
+        outdata[:] = self.render(frames)
+
+    def _render_loop(self):
+        """Keep the ring buffer filled, running on the render thread"""
+        idle = self.blocksize / self.board.sample_rate / 4
+        while self.running:
+            if self.ring.free >= self.blocksize:
+                self.ring.write(self.render(self.blocksize))
+            else:
+                systime.sleep(idle)
+
+    def start(self):
+        """Open and start the stream, doing nothing if it is already running"""
+        if self.backend.active: return
+        self.route()
+        if not self.routes: return
+        outputs = [output for output, _ in self.routes]
+        self.blocksize = outputs[0].blocksize
+        self.log_time = any(output.log_time for output in outputs)
+        self.log_interval = min(output.log_interval for output in outputs)
+        # Compile before the stream opens, numba kernels take far longer than a callback
+        if self.board.plan is None or self.board.plan_blocksize != self.blocksize:
+            self.board.compile(self.blocksize)
+
+        if any(output.threaded for output in outputs):
+            latency = max(output.latency for output in outputs)
+            blocks = max(2, ceil(latency * self.board.sample_rate / self.blocksize))
+            self.ring = RingBuffer(blocks * self.blocksize, self.channels)
+            self.underruns = 0
+            # Prefill so the stream starts with the target latency buffered
+            while self.ring.free >= self.blocksize:
+                self.ring.write(self.render(self.blocksize))
+            self.min_fill_level = self.ring.fill
+            self.running = True
+            self.render_thread = threading.Thread(target=self._render_loop, daemon=True)
+            self.render_thread.start()
+
+        # Create and start the stream
+        try:
+            self.backend.open(self.board.sample_rate, self.channels, self.blocksize, self.audio_callback)
+            print(f"Starting audio stream with {self.channels} channel(s)...")
+            self.backend.start()
+        except Exception as e:
+            print(f"Error starting audio stream: {e}")
+            self.backend.close()
+            self._stop_render_thread()
+
+    def stop(self):
+        """Stop the stream and the render thread"""
+        if self.backend.active:
+            print("Stopping audio stream.")
+            self.backend.stop()
+        self.backend.close()
+        self._stop_render_thread()
+
+    def _stop_render_thread(self):
+        self.running = False
+        if self.render_thread is not None:
+            self.render_thread.join()
+            self.render_thread = None
+        self.ring = None
@@ -0,0 +1,52 @@
+#engine/Bank.py
+import numpy as np
+
+
+def is_bankable(patch):
+    return hasattr(patch, "process_bank")
+
+
+class Bank:
+    """Runs instances of one patch class at the same topological level as a struct of arrays.
+
+    Inputs are gathered from board.bus into (instances, n) arrays, the class's
+    process_bank advances all of them with vectorized NumPy calls and the outputs
+    are scattered back to their rows. The Patch objects stay the source of truth
+    for the GUI and jsonify: their parameters and _bank_state attributes are read
+    before every block and written back after it, together with the last value
+    of every port."""
+
+    def __init__(self, patches, board):
+        self.patches = patches
+        self.board = board
+        self.cls = type(patches[0])
+        self.inputs = {}     # input name -> bus rows, one per instance
+        self.constants = {}  # input name -> (instances, bus rows) of unconnected inputs
+        self.outputs = {name: np.array([p._output_ports[name] for p in patches]) for name in self.cls._io_outputs}
+        for name in self.cls._io_inputs:
+            self.inputs[name] = np.array([p._input_ports.get(name, p._constant_ports.get(name)) for p in patches])
+            unconnected = [k for k, p in enumerate(patches) if name not in p._input_ports]
+            if unconnected:
+                self.constants[name] = (unconnected, self.inputs[name][unconnected])
+
+    def process_block(self, n: int):
+        bus = self.board.bus
+        patches = self.patches
+        for name, (members, rows) in self.constants.items():
+            bus[rows, :n] = np.array([getattr(patches[k], name) for k in members], dtype=np.float64)[:, None]
+        inputs = {name: bus[rows, :n] for name, rows in self.inputs.items()}
+        state = {name: np.array([getattr(p, name) for p in patches], dtype=np.float64)
+                 for name in self.cls._bank_state + self.cls._bank_params}
+
+        outputs = self.cls.process_bank(inputs, state, n, float(self.board.sample_rate))
+
+        for name, rows in self.outputs.items():
+            bus[rows, :n] = outputs[name]
+        for name, block in list(inputs.items()) + [(name, bus[rows, n - 1:n]) for name, rows in self.outputs.items()]:
+            for patch, value in zip(patches, block[:, -1].tolist()):
+                setattr(patch, name, value)
+        for name in self.cls._bank_state:
+            for patch, value in zip(patches, state[name].tolist()):
+                setattr(patch, name, value)
+        for patch in patches:
+            patch.time += n
@@ -0,0 +1,28 @@
+#engine/ConstantFold.py
+
+
+class ConstantFold:
+    """Holds the output rows of pure patches whose inputs are all constant.
+
+    Board.compile() moves such patches out of the plan. Their bus rows keep
+    the values of the last evaluation, so a block only re-runs them when one
+    of their parameters was edited (from the GUI for instance) or the block
+    size changed, and otherwise just advances their time."""
+
+    def __init__(self, patches, board):
+        self.patches = patches
+        self.board = board
+        self.parameters = [(patch, name) for patch in patches for name in patch._constant_ports]
+        self.values = None
+        self.n = 0
+
+    def process_block(self, n: int):
+        values = [getattr(patch, name) for patch, name in self.parameters]
+        if values != self.values or n != self.n:
+            for patch in self.patches:
+                patch.process_block(n)
+            self.values = values
+            self.n = n
+            return
+        for patch in self.patches:
+            patch.time += n
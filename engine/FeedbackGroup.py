@@ -0,0 +1,113 @@
+#engine/FeedbackGroup.py
+
+
+def strongly_connected(patches, sources):
+    """Tarjan's algorithm over the patch graph, where sources[patch] lists the
+    patches feeding it. Returns the components as lists in board order."""
+    index = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    components = []
+    for root in patches:
+        if root in index: continue
+        # Iterative DFS, each frame is (patch, iterator over its sources)
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        frames = [(root, iter(sources[root]))]
+        while frames:
+            patch, edges = frames[-1]
+            src = next(edges, None)
+            if src is not None:
+                if src not in index:
+                    index[src] = low[src] = len(index)
+                    stack.append(src)
+                    on_stack.add(src)
+                    frames.append((src, iter(sources[src])))
+                elif src in on_stack:
+                    low[patch] = min(low[patch], index[src])
+                continue
+            frames.pop()
+            if frames:
+                parent = frames[-1][0]
+                low[parent] = min(low[parent], low[patch])
+            if low[patch] == index[patch]:
+                component = set()
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.add(member)
+                    if member is patch: break
+                components.append(component)
+    position = {patch: i for i, patch in enumerate(patches)}
+    components = [sorted(c, key=position.get) for c in components]
+    components.sort(key=lambda c: position[c[0]])
+    return components
+
+
+def feedback_order(component):
+    """Order the members of a cycle, following their connections where possible.
+
+    Returns (order, back_edges), back_edges being the (patch, input name) pairs
+    that read a member placed later, i.e. where the delay goes. When the order
+    gets stuck the earliest remaining member in board order is taken next."""
+    members = set(component)
+    pending = {patch: {name for name, src in patch.inputs.items() if src in members} for patch in component}
+    order = []
+    back_edges = []
+    remaining = list(component)
+    while remaining:
+        patch = next((p for p in remaining if not any(p.inputs[name] in remaining for name in pending[p])), remaining[0])
+        remaining.remove(patch)
+        order.append(patch)
+        back_edges += [(patch, name) for name in sorted(pending[patch]) if patch.inputs[name] in remaining]
+    return order, back_edges
+
+
+class FeedbackGroup:
+    """Runs the patches of one feedback cycle sample by sample inside a block pass.
+
+    Used when Board.feedback is "sample": inputs in `back_edges` read the value
+    their source produced on the previous sample, all other connections inside
+    the group see the current sample, so the loop only carries a one-sample
+    delay. Rows of board.bus are read and written like any other patch."""
+
+    def __init__(self, patches, back_edges, board):
+        self.patches = patches
+        self.board = board
+        delayed = set(back_edges)
+        self.inputs = []     # per patch: (attribute, bus row, read previous sample)
+        self.outputs = []    # per patch: (attribute, bus row)
+        for patch in patches:
+            self.inputs.append([(name, index, (patch, name) in delayed) for name, index in patch._input_ports.items()])
+            self.outputs.append(list(patch._output_ports.items()))
+
+    def process_block(self, n: int):
+        bus = self.board.bus
+        rows = {}
+        for outputs in self.outputs:
+            for _, index in outputs:
+                # The last slot holds the previous block's final sample until it is overwritten,
+                # so a delayed read of sample -1 at i = 0 sees it
+                rows[index] = [0.0] * (n - 1) + [float(bus[index, n - 1])]
+        for inputs in self.inputs:
+            for _, index, _ in inputs:
+                if index not in rows: rows[index] = bus[index, :n].tolist()
+        steps = [(patch, [(name, rows[index], delay) for name, index, delay in inputs], [(name, rows[index]) for name, index in outputs])
+                 for patch, inputs, outputs in zip(self.patches, self.inputs, self.outputs)]
+
+        for patch in self.patches: patch._in_block = True
+        try:
+            for i in range(n):
+                for patch, inputs, outputs in steps:
+                    for name, values, delay in inputs:
+                        setattr(patch, name, values[i - 1] if delay else values[i])
+                    patch.step()
+                    for name, values in outputs:
+                        values[i] = getattr(patch, name)
+        finally:
+            for patch in self.patches: patch._in_block = False
+        for outputs in self.outputs:
+            for _, index in outputs:
+                bus[index, :n] = rows[index]
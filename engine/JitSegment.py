@@ -0,0 +1,167 @@
+#engine/JitSegment.py
+import re
+import builtins
+import math
+import threading
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+_IDENTIFIER = re.compile(r"(?<![.\w])(self\.)?([A-Za-z_]\w*)")
+_ASSIGNMENT = re.compile(r"^\s*([A-Za-z_]\w*)\s*=(?!=)", re.MULTILINE)
+_NAME = re.compile(r"(?<![.\w])[A-Za-z_]\w*")
+
+# Compiled kernels keyed by their generated source, so recompiling an unchanged graph is free
+_kernels = {}
+_lock = threading.Lock()
+
+
+def is_jittable(patch):
+    return type(patch)._jit_source is not None
+
+
+class JitSegment:
+    """Runs a topologically ordered run of jittable patches as one numba kernel per block.
+
+    Each patch class provides `_jit_source`, the Python body of one sample. In it,
+    port names refer to the current sample of that port and `self.<attr>` refers to
+    persistent patch state. Every patch becomes a sample loop over its bus rows,
+    with its state in local variables and the lines that only depend on
+    unconnected parameters hoisted out of the loop. Bus rows, parameters and
+    state are passed as arrays, so the kernel only depends on the kinds of
+    patches and how they are wired to each other and is reused across boards."""
+
+    available = njit is not None
+
+    def __init__(self, patches, board):
+        self.patches = patches
+        self.board = board
+        self.params = []     # (patch, attribute) for unconnected inputs, reloaded every block
+        self.state = []      # (patch, attribute) for persistent state
+        self.views = []      # (patch, attribute, bus row) scalar attributes refreshed after a block
+        self.rows = []       # bus rows in order of first use
+        self.finishers = [patch._jit_finish for patch in patches if hasattr(patch, "_jit_finish")]
+
+        slots = {}
+        loops = []
+        for k, patch in enumerate(patches):
+            ports = {}
+            for name in patch._io_inputs:
+                if name in patch._input_ports:
+                    ports[name] = self._row(patch._input_ports[name], slots)
+                    self.views.append((patch, name, patch._input_ports[name]))
+                else:
+                    ports[name] = f"_p{len(self.params)}"
+                    self.params.append((patch, name))
+            for name, index in patch._output_ports.items():
+                ports[name] = self._row(index, slots)
+                self.views.append((patch, name, index))
+            loops.append(self._lower(patch, k, ports))
+
+        lines = [f"_r{r} = rows[{r}]" for r in range(len(self.rows))]
+        lines += [f"_p{p} = params[{p}]" for p in range(len(self.params))]
+        lines += [f"_s{s} = state[{s}]" for s in range(len(self.state))]
+        # One loop per patch rather than one loop over all of them: the state of a
+        # patch stays in registers and stateless loops over contiguous rows vectorize
+        for name, hoisted, loop in loops:
+            lines += [f"# {name}"] + hoisted + ["for i in range(n):"] + [f"    {line}" for line in loop]
+        lines += [f"state[{s}] = _s{s}" for s in range(len(self.state))]
+        self.source = "def kernel(bus, rows, state, params, n, sample_rate):\n" + "".join(f"    {line}\n" for line in lines)
+        self.kernel = _kernels.get(self.source)
+        self.reload = False
+        if self.kernel is None:
+            if board.audio_engine.backend.active:
+                # Compiling takes far longer than a block, so during playback it runs on
+                # its own thread and the patches take their Python path until it is done
+                threading.Thread(target=self._compile, daemon=True).start()
+            else:
+                self._compile()
+
+        self.row_indices = np.array(self.rows or [0], dtype=np.int64)
+        self.param_values = np.zeros(max(len(self.params), 1))
+        self.state_values = np.array([float(getattr(p, a)) for p, a in self.state] or [0.0])
+
+    def _row(self, index, slots):
+        if index not in slots:
+            slots[index] = len(self.rows)
+            self.rows.append(index)
+        return f"bus[_r{slots[index]}, i]"
+
+    def _lower(self, patch, k, ports):
+        """Return (name, hoisted lines, loop body lines) of one patch"""
+        source = type(patch)._jit_source
+        assigned = _ASSIGNMENT.findall(source)
+        local = {name for name in assigned if name not in ports}
+        slots = {}
+
+        def substitute(match):
+            is_state, name = match.groups()
+            if is_state:
+                if name not in slots:
+                    slots[name] = len(self.state)
+                    self.state.append((patch, name))
+                return f"_s{slots[name]}"
+            if name in ports: return ports[name]
+            if name in local: return f"{name}_{k}"
+            return name
+
+        # A local assigned once from parameters and other such locals is the same
+        # for the whole block, like the coefficients of a filter with a fixed cutoff
+        invariant = {f"_p{p}" for p in range(len(self.params))} | {"sample_rate", "math"}
+        once = {f"{name}_{k}" for name in local if assigned.count(name) == 1}
+        hoisted, loop = [], []
+        for line in _IDENTIFIER.sub(substitute, source).splitlines():
+            if not line.strip(): continue
+            target, _, expr = line.partition("=")
+            target = target.strip()
+            if target in once and not line.startswith((" ", "\t")) and "[" not in target:
+                used = set(_NAME.findall(expr)) - set(dir(builtins))
+                if "bus[" not in expr and used <= invariant:
+                    hoisted.append(line)
+                    invariant.add(target)
+                    continue
+            loop.append(line)
+        return type(patch).__name__, hoisted, loop
+
+    def _compile(self):
+        self.kernel = _compile(self.source)
+
+    def process_block(self, n: int):
+        if self.kernel is None:
+            for patch in self.patches:
+                patch.process_block(n)
+            self.reload = True
+            return
+        if self.reload:
+            # The Python path advanced the patches while the kernel was compiling
+            self.state_values[:len(self.state)] = [float(getattr(p, a)) for p, a in self.state]
+            self.reload = False
+        bus = self.board.bus
+        values = self.param_values
+        for p, (patch, name) in enumerate(self.params):
+            values[p] = getattr(patch, name)
+
+        self.kernel(bus, self.row_indices, self.state_values, values, n, float(self.board.sample_rate))
+
+        for s, (patch, name) in enumerate(self.state):
+            setattr(patch, name, float(self.state_values[s]))
+        for patch, name, r in self.views:
+            setattr(patch, name, float(bus[r, n - 1]))
+        for patch in self.patches:
+            patch.time += n
+        for finish in self.finishers:
+            finish()
+
+
+def _compile(source):
+    with _lock:
+        kernel = _kernels.get(source)
+        if kernel is None:
+            scope = {"math": math}
+            exec(source, scope)
+            kernel = njit("void(float64[:,:], int64[:], float64[:], float64[:], int64, float64)")(scope["kernel"])
+            _kernels[source] = kernel
+    return kernel
@@ -0,0 +1,115 @@
+#engine/Profiler.py
+import json
+import threading
+import time
+
+
+class Profiler:
+    """Opt-in CPU profiler for a board, enabled with Board.enable_profiling().
+
+    Records the cumulative block time of every entry of the execution plan and,
+    for callbacks of the audio engine, the wall time against the deadline
+    (blocksize / sample_rate), the worst case and the xruns reported by the
+    stream status. When profiling is disabled the board does not call it at all."""
+
+    def __init__(self, board):
+        self.board = board
+        self.reset()
+        self._plan = None
+        self._labels = ()
+        self._dump_thread = None
+        self._dumping = threading.Event()
+
+    def reset(self):
+        self.patch_time = {}
+        self.blocks = 0
+        self.samples = 0
+        self.callbacks = 0
+        self.callback_time = 0.0
+        self.worst_callback = 0.0
+        self.deadline = 0.0
+        self.deadline_misses = 0
+        self.xruns = 0
+        self._callback_start = 0.0
+
+    def _label(self, process):
+        owner = getattr(process, "__self__", process)
+        if owner in self.board.patches:
+            return f"{type(owner).__name__}#{self.board.patches.index(owner)}"
+        patches = getattr(owner, "patches", ())
+        members = ",".join(f"{type(p).__name__}#{self.board.patches.index(p)}" for p in patches if p in self.board.patches)
+        return f"{type(owner).__name__}[{members}]"
+
+    def run(self, plan, n: int):
+        """Run one block of the plan, timing every entry"""
+        if plan is not self._plan:
+            self._plan = plan
+            self._labels = tuple(self._label(process) for process in plan)
+        totals = self.patch_time
+        clock = time.perf_counter
+        for process, label in zip(plan, self._labels):
+            start = clock()
+            process(n)
+            totals[label] = totals.get(label, 0.0) + clock() - start
+        self.blocks += 1
+        self.samples += n
+
+    def begin_callback(self):
+        self._callback_start = time.perf_counter()
+
+    def end_callback(self, frames: int, status):
+        elapsed = time.perf_counter() - self._callback_start
+        self.deadline = frames / self.board.sample_rate
+        self.callbacks += 1
+        self.callback_time += elapsed
+        self.worst_callback = max(self.worst_callback, elapsed)
+        if elapsed > self.deadline: self.deadline_misses += 1
+        if status: self.xruns += 1
+
+    def snapshot(self):
+        """Return the current statistics as a JSON-serializable dict"""
+        patch_time = dict(self.patch_time)
+        total = sum(patch_time.values()) or 1.0
+        mean_callback = self.callback_time / self.callbacks if self.callbacks else 0.0
+        return {
+            "blocks": self.blocks,
+            "samples": self.samples,
+            "patches": {
+                label: {
+                    "seconds": seconds,
+                    "share": seconds / total,
+                    "us_per_block": 1e6 * seconds / self.blocks if self.blocks else 0.0
+                }
+                for label, seconds in sorted(patch_time.items(), key=lambda item: -item[1])
+            },
+            "callbacks": self.callbacks,
+            "deadline_ms": 1e3 * self.deadline,
+            "callback_mean_ms": 1e3 * mean_callback,
+            "callback_worst_ms": 1e3 * self.worst_callback,
+            "load": mean_callback / self.deadline if self.deadline else 0.0,
+            "deadline_misses": self.deadline_misses,
+            "xruns": self.xruns
+        }
+
+    def dump(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+    def start_dump(self, path: str, interval: float = 10.0):
+        """Write a snapshot to `path` every `interval` seconds from a background thread"""
+        self.stop_dump()
+        self._dumping.clear()
+
+        def loop():
+            while not self._dumping.wait(interval):
+                self.dump(path)
+            self.dump(path)
+
+        self._dump_thread = threading.Thread(target=loop, daemon=True)
+        self._dump_thread.start()
+
+    def stop_dump(self):
+        if self._dump_thread is not None:
+            self._dumping.set()
+            self._dump_thread.join()
+            self._dump_thread = None
@@ -0,0 +1,44 @@
+#engine/RingBuffer.py
+import numpy as np
+
+
+class RingBuffer:
+    """Preallocated single-producer single-consumer ring buffer of float32 frames.
+
+    Only the producer advances write_index and only the consumer advances
+    read_index, and each index is published after its data is copied, so
+    neither side needs a lock."""
+
+    def __init__(self, capacity: int, channels: int = 1):
+        self.capacity = capacity
+        self.buffer = np.zeros((capacity, channels), dtype=np.float32)
+        # Total frames written and read so far, they only ever grow
+        self.write_index = 0
+        self.read_index = 0
+
+    @property
+    def fill(self):
+        return self.write_index - self.read_index
+
+    @property
+    def free(self):
+        return self.capacity - self.fill
+
+    def write(self, frames):
+        """Copy a (n, channels) block in, the caller checks there are n free frames"""
+        n = len(frames)
+        start = self.write_index % self.capacity
+        first = min(n, self.capacity - start)
+        self.buffer[start:start + first] = frames[:first]
+        self.buffer[:n - first] = frames[first:]
+        self.write_index += n
+
+    def read(self, out):
+        """Copy up to len(out) frames into out and return how many were available"""
+        n = min(len(out), self.fill)
+        start = self.read_index % self.capacity
+        first = min(n, self.capacity - start)
+        out[:first] = self.buffer[start:start + first]
+        out[first:n] = self.buffer[:n - first]
+        self.read_index += n
+        return n
@@ -0,0 +1,26 @@
+from .JitSegment import JitSegment, is_jittable
+from .Bank import Bank, is_bankable
+from .ConstantFold import ConstantFold
+from .DirtyCheck import DirtyCheck
+from .FeedbackGroup import FeedbackGroup, strongly_connected, feedback_order
+from .RingBuffer import RingBuffer
+from .AudioEngine import AudioEngine
+from .Profiler import Profiler
+from .backends import AudioBackend, SoundDeviceBackend, NullBackend
+
+__all__ = ["JitSegment",
+           "is_jittable",
+           "Bank",
+           "is_bankable",
+           "ConstantFold",
+           "DirtyCheck",
+           "FeedbackGroup",
+           "strongly_connected",
+           "feedback_order",
+           "RingBuffer",
+           "AudioEngine",
+           "Profiler",
+           "AudioBackend",
+           "SoundDeviceBackend",
+           "NullBackend"
+           ]
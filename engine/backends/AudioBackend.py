@@ -0,0 +1,27 @@
+#engine/backends/AudioBackend.py
+from abc import ABC, abstractmethod
+
+
+class AudioBackend(ABC):
+    """Output stream used by the AudioEngine.
+
+    A backend calls `callback(outdata, frames, time, status)` once per block,
+    with outdata a (frames, channels) float32 array to fill, like sounddevice."""
+
+    def __init__(self):
+        self.active = False
+
+    @abstractmethod
+    def open(self, sample_rate: int, channels: int, blocksize: int, callback):
+        pass
+
+    @abstractmethod
+    def start(self):
+        pass
+
+    @abstractmethod
+    def stop(self):
+        pass
+
+    def close(self):
+        pass
@@ -0,0 +1,70 @@
+#engine/backends/NullBackend.py
+import threading
+import time
+from types import SimpleNamespace
+import numpy as np
+from .AudioBackend import AudioBackend
+
+
+class NullBackend(AudioBackend):
+    """Headless backend that calls the audio callback from a timer thread.
+
+    With realtime=True blocks are requested at the real block rate, otherwise as
+    fast as possible. The produced audio is kept in memory when capture=True,
+    and the stream stops by itself after `duration` seconds of audio if given."""
+
+    def __init__(self, realtime: bool = True, capture: bool = True, duration: float | None = None):
+        super().__init__()
+        self.realtime = realtime
+        self.capture = capture
+        self.duration = duration
+        self.blocks = []
+        self.frames = 0
+        self.thread = None
+
+    def open(self, sample_rate: int, channels: int, blocksize: int, callback):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.blocksize = blocksize
+        self.callback = callback
+        self.blocks = []
+        self.frames = 0
+
+    def _run(self):
+        period = self.blocksize / self.sample_rate
+        limit = int(self.duration * self.sample_rate) if self.duration is not None else None
+        outdata = np.zeros((self.blocksize, self.channels), dtype=np.float32)
+        start = time.perf_counter()
+        deadline = start
+        while self.active and (limit is None or self.frames < limit):
+            stream_time = SimpleNamespace(currentTime=time.perf_counter(), outputBufferDacTime=deadline + period)
+            self.callback(outdata, self.blocksize, stream_time, None)
+            if self.capture: self.blocks.append(outdata.copy())
+            self.frames += self.blocksize
+            if self.realtime:
+                # Schedule against absolute times so the block rate does not drift
+                deadline += period
+                delay = deadline - time.perf_counter()
+                if delay > 0: time.sleep(delay)
+        self.active = False
+
+    def start(self):
+        self.active = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def wait(self):
+        """Block until a stream with a duration has finished"""
+        if self.thread is not None: self.thread.join()
+
+    def stop(self):
+        self.active = False
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+        self.thread = None
+
+    @property
+    def captured(self):
+        """Everything played so far as a (frames, channels) float32 array"""
+        if not self.blocks: return np.zeros((0, getattr(self, "channels", 1)), dtype=np.float32)
+        return np.concatenate(self.blocks)
@@ -0,0 +1,36 @@
+#engine/backends/SoundDeviceBackend.py
+import numpy as np
+from .AudioBackend import AudioBackend
+
+
+class SoundDeviceBackend(AudioBackend):
+    """Plays through the default PortAudio output device with sounddevice."""
+
+    def __init__(self):
+        super().__init__()
+        self.stream = None
+
+    def open(self, sample_rate: int, channels: int, blocksize: int, callback):
+        # Imported here so boards can be built and rendered without PortAudio
+        import sounddevice as sd
+        self.stream = sd.OutputStream(
+            samplerate=sample_rate,
+            channels=channels,
+            dtype=np.float32,
+            callback=callback,
+            blocksize=blocksize
+        )
+
+    def start(self):
+        self.stream.start()
+        self.active = True
+
+    def stop(self):
+        if self.stream is not None:
+            self.stream.stop()
+        self.active = False
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
@@ -0,0 +1,14 @@
+from .AudioBackend import AudioBackend
+from .SoundDeviceBackend import SoundDeviceBackend
+from .NullBackend import NullBackend
+
+BACKENDS = {
+    "sounddevice": SoundDeviceBackend,
+    "null": NullBackend
+}
+
+__all__ = ["AudioBackend",
+           "SoundDeviceBackend",
+           "NullBackend",
+           "BACKENDS"
+           ]
@@ -127,7 +127,8 @@ class NodeEditorView(QGraphicsView):
         
         if filename:
             try:
-                file_wave = FileWave(filename)
+                # Streaming only reads the header, so the GUI thread doesn't wait for the decode
+                file_wave = FileWave(filename, streaming=True)
                 node = self.add_waveform_node(file_wave)
                 node.setPos(self.mapToScene(pos))
             except Exception as e:
@@ -278,7 +279,7 @@ class NodeEditorView(QGraphicsView):
             for input_name, source_patch in patch.inputs.items():
                 if source_patch in self.node_map:
                     source_node = self.node_map[source_patch]
-                    output_port_name = source_patch.outputs.get(patch, "")
+                    output_port_name = patch.getSourcePort(input_name)
                     
                     # Find the corresponding ports
                     source_port = None
@@ -1,15 +1,19 @@
 #patches/Abs.py
 from .Patch import Patch
+import numpy as np
 
 class Abs(Patch):
 
     _metadata = {
+        "pure": True,
         "io": {
             "input":"in",
             "output":"out"
         }
     }
 
+    _jit_source = "output = abs(input)"
+
     def __init__(self,input:float=0.0):
         super().__init__()
         self.input = input
@@ -19,4 +23,8 @@ class Abs(Patch):
         self.getInputs()
         #print(self.input, self.amplification)
         self.output = abs(self.input)
-        self.time+=1
\ No newline at end of file
+        self.time+=1
+
+    def process_block(self, n: int):
+        self.setOutputBlock("output", np.abs(self.getInputBlock("input", n)))
+        self.time+=n
\ No newline at end of file
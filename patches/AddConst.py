@@ -11,6 +11,8 @@ class AddConst(Patch):
         }
     }
 
+    _jit_source = "output = input + val"
+
     def __init__(self,val:float=1.0,input:float=0.0):
         super().__init__()
         self.input = input
@@ -22,4 +24,12 @@ class AddConst(Patch):
         #print(self.input, self.amplification)
         self.output = self.input + self.val
         self.time+=1
+        self.input = 0.0 # Reseting variable input
+
+    def process_block(self, n: int):
+        self.setOutputBlock("output", self.getInputBlock("input", n) + self.getInputBlock("val", n))
+        self.time+=n
+        self.input = 0.0 # Reseting variable input
+
+    def _jit_finish(self):
         self.input = 0.0 # Reseting variable input
\ No newline at end of file
@@ -1,92 +1,70 @@
 #patches/AudioOutput
-import sounddevice as sd
 import numpy as np
 from .Patch import Patch
 
 class AudioOutput(Patch):
-    """Outputs audio to the sound device using a non-blocking stream."""
-    
+    """Outputs audio to the sound device through the board's audio engine.
+
+    All AudioOutputs of a board share one stream. Each one gets its own channel,
+    unless it names a `bus`, in which case outputs on the same bus are mixed.
+    With threaded=True a render thread keeps a ring buffer `latency` seconds
+    ahead of the stream, and the audio callback only copies from it."""
+
     _metadata = {
+        "sink": True,
         "io": {
             "input": "in"
         }
     }
-    
-    def __init__(self, input:float=0.0, blocksize:int=1024,log_time:bool=False,log_interval:float=30.0):
+
+    def __init__(self, input:float=0.0, blocksize:int=1024,log_time:bool=False,log_interval:float=30.0,threaded:bool=False,latency:float=0.1,bus:str|None=None):
         super().__init__()
         self.input = input
-        self.stream = None
         self.blocksize = blocksize
         self.buffer = np.zeros(blocksize, dtype=np.float32)
-        self.buffer_index = 0
         self.log_time = log_time
         self.log_interval = log_interval
-        self.last_log = 0.0
-        self.num_callbacks = 0
+        self.threaded = threaded
+        self.latency = latency
+        self.bus = bus
+
+    @property
+    def underruns(self):
+        return self.board.audio_engine.underruns if self.board is not None else 0
+
+    @property
+    def fill_level(self):
+        """Frames currently buffered ahead of the stream in threaded mode"""
+        return self.board.audio_engine.fill_level if self.board is not None else 0
+
+    @property
+    def min_fill_level(self):
+        return self.board.audio_engine.min_fill_level if self.board is not None else 0
 
-    def audio_callback(self, outdata, frames, time, status):
-        if self.log_time and (time.currentTime - self.last_log) >= self.log_interval:
-            print(self.num_callbacks / (time.currentTime - self.last_log))
-            self.last_log = time.currentTime
-            self.num_callbacks = 0
-        self.num_callbacks += 1
-        if status:
-            print(f"Status: {status}")
-        
-        # Fill the output buffer with samples from our buffer
-        outdata[:] = self.buffer.reshape(-1, 1)
-        
-        # Generate new samples for the next callback
-        for i in range(self.blocksize):
-            # Step all patches in the board
-            for patch in self.board.patches:
-                if patch != self:  # Don't step ourselves
-                    patch.step()
-            
-            # Get the input value
-            self.getInputs()
-            self.buffer[i] = self.input
-    
     def play(self):
-        """Start the audio stream."""
-        # Always stop existing stream first to ensure clean state
-        if self.stream is not None:
-            try:
-                self.stream.stop()
-                self.stream.close()
-            except:
-                pass
-            self.stream = None
-        
-        # Initialize the buffer with silence
-        self.buffer = np.zeros(self.blocksize, dtype=np.float32)
-        self.buffer_index = 0
-        
-        # Create and start the stream
-        try:
-            self.stream = sd.OutputStream(
-                samplerate=self.board.sample_rate,
-                channels=1,
-                dtype=np.float32,
-                callback=self.audio_callback,
-                blocksize=self.blocksize
-            )
-            
-            print("Starting audio stream...")
-            self.stream.start()
-        except Exception as e:
-            print(f"Error starting audio stream: {e}")
-            self.stream = None
-    
+        """Start the board's audio stream, if it is not running yet."""
+        self.board.audio_engine.start()
+
     def stop(self):
-        """Stop the audio stream."""
-        if self.stream is not None:
-            print("Stopping audio stream.")
-            self.stream.stop()
-            self.stream.close()
-            self.stream = None
-    
+        """Stop the board's audio stream."""
+        self.board.audio_engine.stop()
+
+    def process_block(self, n: int):
+        self.buffer = self.getInputBlock("input", n).astype(np.float32)
+        self.time += n
+
     def step(self):
         # AudioOutput doesn't need to do anything in step
-        # The audio callback handles the stepping of other patches
-        pass
\ No newline at end of file
+        # The audio engine handles the stepping of other patches
+        pass
+
+    def jsonify(self, patch_ids=None, position=None):
+        result = super().jsonify(patch_ids, position)
+        params = result.get("params", {})
+        params["blocksize"] = self.blocksize
+        params["threaded"] = self.threaded
+        params["latency"] = self.latency
+        if self.bus is not None:
+            params["bus"] = self.bus
+        result["params"] = params
+        return result
\ No newline at end of file
@@ -9,6 +9,7 @@ from matplotlib.patches import Circle, Rectangle
 class BouncingBall(VisualPatch):
 
     _metadata = {
+        "sink": True,
         "io": {
             "v0":"in",
             "acc":"in",
@@ -5,6 +5,8 @@ class ChromaticFrequencyStepper(Patch):
     """Outputs mouse X and Y positions as properties."""
 
     _metadata = {
+        "pure": True,
+        "rate": "control",
         "io": {
             "input":"in",
             "output":"out"
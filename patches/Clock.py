@@ -6,6 +6,7 @@ import time
 class Clock(Patch):
 
     _metadata = {
+        "rate": "trigger",
         "io": {
             "frequency":"in",
             "output":"out"
@@ -11,6 +11,11 @@ class CountTo(Patch):
         }
     }
 
+    _jit_source = """
+self.output = (self.output+speed) % limit
+output = self.output
+"""
+
     def __init__(self,speed:float=1.0,limit:float=100000):
         super().__init__()
         self.speed = speed
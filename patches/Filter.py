@@ -1,9 +1,37 @@
 #patches/Filter.py
 from .Patch import Patch
+import numpy as np
 import math
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _svf(x, f, q, low, band, low_pass, high_pass, band_pass):
+    """State-variable recurrence over a block, returns the final (low, band) state"""
+    for i in range(len(x)):
+        low = low + f[i] * band
+        high = x[i] - low - q[i] * band
+        band = f[i] * high + band
+        low_pass[i] = low
+        high_pass[i] = high
+        band_pass[i] = band
+    return low, band
+
+# Compiled on import rather than on the first block, which would run in the audio
+# callback, or wait there for the numba engine compiling a kernel on another thread.
+# The pure Python loop runs on lists instead
+_svf_jit = njit("UniTuple(float64, 2)(float64[:], float64[:], float64[:], float64, float64, float64[:], float64[:], float64[:])",
+                cache=True)(_svf) if njit is not None else None
+
+
 class Filter(Patch):
-    """A simple low-pass and high-pass filter implementation."""
+    """A simple low-pass and high-pass filter implementation.
+
+    The coefficients are only recomputed when cutoff or resonance change, and
+    blocks run the recurrence in a numba loop when numba is installed."""
 
     _metadata = {
         "io": {
@@ -16,6 +44,18 @@ class Filter(Patch):
         }
     }
 
+    _jit_source = """
+f = 2 * math.sin(math.pi * min(0.25, cutoff / (sample_rate * 2)))
+q = 1.0 - resonance
+low_pass = self.low_pass_prev + f * self.band_pass_prev
+high_pass = input - low_pass - q * self.band_pass_prev
+band_pass = f * high_pass + self.band_pass_prev
+self.low_pass_prev = low_pass
+self.band_pass_prev = band_pass
+"""
+
+    _bank_state = ("low_pass_prev", "band_pass_prev")
+
     def __init__(self, cutoff=1000,input:float=0.0,low_pass:float=0.0, high_pass:float=0.0, band_pass:float=0.0, resonance=0.5):
         super().__init__()
         self.cutoff = cutoff
@@ -28,14 +68,24 @@ class Filter(Patch):
         # Filter state variables
         self.low_pass_prev = 0.0
         self.band_pass_prev = 0.0
+        self._coefficient_key = None
+        self._coefficients = (0.0, 0.0)
+
+    def coefficients(self, cutoff, resonance):
+        """(f, q) of the state variable filter, cached while cutoff and resonance stay the same"""
+        key = (cutoff, resonance, self.board.sample_rate)
+        if key != self._coefficient_key:
+            f = 2 * math.sin(math.pi * min(0.25, cutoff / (self.board.sample_rate * 2)))
+            self._coefficients = (f, 1.0 - resonance)
+            self._coefficient_key = key
+        return self._coefficients
         
     def step(self):
         self.getInputs()
         
         # Calculate filter coefficients based on cutoff frequency
         # Using a state variable filter design
-        f = 2 * math.sin(math.pi * min(0.25, self.cutoff / (self.board.sample_rate * 2)))
-        q = 1.0 - self.resonance
+        f, q = self.coefficients(self.cutoff, self.resonance)
         
         # Filter processing
         self.low_pass = self.low_pass_prev + f * self.band_pass_prev
@@ -46,4 +96,59 @@ class Filter(Patch):
         self.low_pass_prev = self.low_pass
         self.band_pass_prev = self.band_pass
         
-        self.time += 1
\ No newline at end of file
+        self.time += 1
+
+    def process_block(self, n: int):
+        x = self.getInputBlock("input", n)
+        cutoff = self.getInputBlock("cutoff", n)
+        resonance = self.getInputBlock("resonance", n)
+        if cutoff[0] == cutoff[-1] and resonance[0] == resonance[-1] and (cutoff == cutoff[0]).all() and (resonance == resonance[0]).all():
+            f, q = self.coefficients(float(cutoff[0]), float(resonance[0]))
+            f = np.full(n, f)
+            q = np.full(n, q)
+        else:
+            f = 2 * np.sin(np.pi * np.minimum(0.25, cutoff / (self.board.sample_rate * 2)))
+            q = 1.0 - resonance
+        if _svf_jit is not None:
+            low_pass, high_pass, band_pass = np.empty(n), np.empty(n), np.empty(n)
+            low, band = _svf_jit(x, f, q, self.low_pass_prev, self.band_pass_prev, low_pass, high_pass, band_pass)
+        else:
+            low_pass, high_pass, band_pass = [0.0] * n, [0.0] * n, [0.0] * n
+            low, band = _svf(x.tolist(), f.tolist(), q.tolist(), self.low_pass_prev, self.band_pass_prev, low_pass, high_pass, band_pass)
+        self.low_pass_prev = float(low)
+        self.band_pass_prev = float(band)
+        self.setOutputBlock("low_pass", low_pass)
+        self.setOutputBlock("high_pass", high_pass)
+        self.setOutputBlock("band_pass", band_pass)
+        self.time += n
+
+    @classmethod
+    def process_bank(cls, inputs, state, n, sample_rate):
+        f = 2 * np.sin(np.pi * np.minimum(0.25, inputs["cutoff"] / (sample_rate * 2)))
+        q = 1.0 - inputs["resonance"]
+        if _svf_jit is not None:
+            # The compiled loop beats stepping all instances together with NumPy
+            outputs = {name: np.empty_like(f) for name in ("low_pass", "high_pass", "band_pass")}
+            low, band = state["low_pass_prev"], state["band_pass_prev"]
+            for k in range(len(f)):
+                low[k], band[k] = _svf_jit(inputs["input"][k], f[k], q[k], low[k], band[k],
+                                           outputs["low_pass"][k], outputs["high_pass"][k], outputs["band_pass"][k])
+            return outputs
+        # The recursion runs over time, every sample is one step of all instances
+        f = f.T
+        q = q.T
+        x = inputs["input"].T
+        low_pass = np.empty_like(x)
+        high_pass = np.empty_like(x)
+        band_pass = np.empty_like(x)
+        low = state["low_pass_prev"]
+        band = state["band_pass_prev"]
+        for i in range(n):
+            low = low + f[i] * band
+            high_pass[i] = x[i] - low - q[i] * band
+            band = f[i] * high_pass[i] + band
+            low_pass[i] = low
+            band_pass[i] = band
+        state["low_pass_prev"][:] = low
+        state["band_pass_prev"][:] = band
+        return {"low_pass": low_pass.T, "high_pass": high_pass.T, "band_pass": band_pass.T}
@@ -178,6 +178,7 @@ class HandDetector:
 class HandCuboid(VisualPatch):
     
     _metadata = {
+        "sink": True,
         "io": {
             "cuboid_height": "out",
             "cuboid_width": "out", 
@@ -7,6 +7,7 @@ class KeyboardInput(Patch):
     """Captures keyboard input and outputs note values based on keyboard layout."""
 
     _metadata = {
+        "rate": "control",
         "io": {
             "chromatic_layout": "out",
             "keyboard_layout": "out",
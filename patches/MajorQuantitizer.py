@@ -6,6 +6,7 @@ class MajorQuantitizer(Patch):
     major_tones = [0, 2, 4, 5, 7, 9, 11]
 
     _metadata = {
+        "pure": True,
         "io": {
             "in_note":"in",
             "scale_root":"in",
@@ -13,6 +14,11 @@ class MajorQuantitizer(Patch):
         }
     }
 
+    _jit_source = """
+adj_note = math.floor(in_note - 1)
+out_note = (0, 2, 4, 5, 7, 9, 11)[adj_note%7]+12*(adj_note//7) + scale_root
+"""
+
     def __init__(self,in_note:float=0.0, scale_root:float=0.0):
         super().__init__()
         self.in_note = in_note 
@@ -4,6 +4,8 @@ from .Patch import Patch
 class Map(Patch):
 
     _metadata = {
+        "pure": True,
+        "rate": "control",
         "io": {
             "input":"in",
             "inlower":"in",
@@ -14,6 +16,11 @@ class Map(Patch):
         }
     }
 
+    _jit_source = """
+scaleMult = (outupper-outlower)/(inupper-inlower)
+output = (input-inlower)*scaleMult + outlower
+"""
+
     def __init__(self,input:float=0.0,inlower:float=0.0,inupper:float=1.0,outlower:float=0.0,outupper:float=12.0):
         super().__init__()
         self.input = input
@@ -27,4 +34,11 @@ class Map(Patch):
         self.getInputs()
         scaleMult = (self.outupper-self.outlower)/(self.inupper-self.inlower)
         self.output = (self.input-self.inlower)*scaleMult + self.outlower
-        self.time+=1
\ No newline at end of file
+        self.time+=1
+
+    def process_block(self, n: int):
+        inlower = self.getInputBlock("inlower", n)
+        outlower = self.getInputBlock("outlower", n)
+        scaleMult = (self.getInputBlock("outupper", n)-outlower)/(self.getInputBlock("inupper", n)-inlower)
+        self.setOutputBlock("output", (self.getInputBlock("input", n)-inlower)*scaleMult + outlower)
+        self.time+=n
\ No newline at end of file
@@ -7,6 +7,10 @@ class MouseData(Patch):
     """Outputs mouse X, Y positions and scroll delta as properties."""
 
     _metadata = {
+        "rate": "control",
+        "rates": {
+            "mouseScroll": "trigger"
+        },
         "io": {
             "mouseX": "out",
             "mouseY": "out",
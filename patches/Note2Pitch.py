@@ -1,10 +1,13 @@
 #patches/VCA.py
 from .Patch import Patch
 from math import pow
+import numpy as np
 
 class Note2Pitch(Patch):
 
     _metadata = {
+        "pure": True,
+        "rate": "control",
         "io": {
             "input":"in",
             "base_pitch":"in",
@@ -12,6 +15,8 @@ class Note2Pitch(Patch):
         }
     }
 
+    _jit_source = "output = base_pitch * 2.0 ** (input/12)"
+
     def __init__(self,input:float=0.0,base_pitch:float=110):
         super().__init__()
         self.base_pitch = base_pitch
@@ -21,4 +26,8 @@ class Note2Pitch(Patch):
     def step(self):
         self.getInputs()
         self.output = self.base_pitch * pow(2.0,self.input/12)
-        self.time+=1
\ No newline at end of file
+        self.time+=1
+
+    def process_block(self, n: int):
+        self.setOutputBlock("output", self.getInputBlock("base_pitch", n) * np.power(2.0,self.getInputBlock("input", n)/12))
+        self.time+=n
\ No newline at end of file
@@ -1,6 +1,7 @@
 #patches/Patch.py
 from typing import Dict, List
 from abc import ABC, abstractmethod
+import numpy as np
 
 # Modified Patch class to support audio streaming
 class Patch(ABC):
@@ -11,6 +12,23 @@ class Patch(ABC):
     _io_outputs = ()       # Tuple of output parameter names from "io"
     _waveio_inputs = ()    # Tuple of input parameter names from "waveio"
     _waveio_outputs = ()   # Tuple of output parameter names from "waveio"
+    _control_outputs = ()  # Tuple of output names declared "control" or "trigger" rate
+    _trigger_outputs = ()  # Tuple of output names declared "trigger" rate
+    _sink = False          # Has side effects (sound, display, printing), declared "sink"
+    _pure = False          # Outputs only depend on the current inputs, declared "pure"
+
+    # Python body of one sample for the numba engine (see engine/JitSegment.py), None if not jittable
+    _jit_source = None
+
+    # Classes with a vectorized form define a classmethod
+    #   process_bank(cls, inputs, state, n, sample_rate)
+    # advancing a bank of instances at once (see engine/Bank.py). inputs maps each
+    # input name to an (instances, n) array, state maps each name of _bank_state to
+    # an (instances,) array updated in place and each name of _bank_params to an
+    # (instances,) array of settings, and it returns a dict of (instances, n)
+    # output arrays. Classes without one are never banked.
+    _bank_state = ()
+    _bank_params = ()
     
     def __init_subclass__(cls, **kwargs):
         """Automatically initialize metadata cache when a patch class is defined"""
@@ -29,21 +47,133 @@ class Patch(ABC):
         cls._waveio_inputs = tuple(k for k, v in waveio.items() if v == "in")
         cls._waveio_outputs = tuple(k for k, v in waveio.items() if v == "out")
 
+        # Output rates: "audio" (default), "control" (held between control ticks)
+        # or "trigger" (emitted on the first sample of a control tick only).
+        # "rate" sets it for the whole patch and "rates" per output port.
+        rate = metadata.get('rate', 'audio')
+        rates = {k: metadata.get('rates', {}).get(k, rate) for k in cls._io_outputs}
+        cls._control_outputs = tuple(k for k, v in rates.items() if v in ("control", "trigger"))
+        cls._trigger_outputs = tuple(k for k, v in rates.items() if v == "trigger")
+        cls._sink = bool(metadata.get('sink', False))
+        cls._pure = bool(metadata.get('pure', False))
+
     
     def __init__(self, inputs: Dict[str, 'Patch'] | None= None, outputs: Dict['Patch', str] | None= None):
         self.inputs = inputs or  dict()
         self.outputs = outputs or dict()
         self.time = 0
         self.board = None
+        self.input_ports = dict()
+        # Row indices into board.bus, assigned by Board.compile()
+        self._input_ports = dict()
+        self._output_ports = dict()
+        self._constant_ports = dict()
+        self._ramp_ports = dict()
+        self._in_block = False
+        self._control_rate = False
     
     def getInputs(self):
+        # Inside process_block the inputs were already set from the input blocks
+        if self._in_block: return
         for k, v in self.inputs.items():
-            setattr(self, k, v.getOutput(self))
+            setattr(self, k, v.getOutput(self, self.getSourcePort(k)))
     
-    def getOutput(self, patch: 'Patch'):
+    def getOutput(self, patch: 'Patch', name: str | None = None):
+        """Return output `name` once this patch has caught up with `patch`.
+
+        step() runs at most once per sample however many consumers read the
+        output, later readers get the cached attribute."""
         while self.time < patch.time:
             self.step()
-        return getattr(self, self.outputs[patch])
+        return getattr(self, name or self.outputs[patch])
+
+    def getSourcePort(self, name: str):
+        """Name of the output of self.inputs[name] connected to input `name`.
+
+        outputs is keyed by consumer, so it only remembers one port per consumer
+        patch; input_ports is exact even when one patch reads several outputs of
+        the same source."""
+        return self.input_ports.get(name) or self.inputs[name].outputs.get(self, "")
+
+    def getInputBlock(self, name: str, n: int):
+        """Return the next n samples of input `name` as a view of its board.bus row.
+
+        Unconnected inputs get their own constant row, refilled from the attribute."""
+        index = self._input_ports.get(name)
+        if index is None:
+            index = self._constant_ports.get(name)
+            if index is None:
+                return np.full(n, getattr(self, name), dtype=np.float64)
+            block = self.board.bus[index, :n]
+            block.fill(getattr(self, name))
+            return block
+        block = self.board.bus[index, :n]
+        setattr(self, name, float(block[-1]))
+        return block
+
+    def setOutputBlock(self, name: str, block):
+        """Copy the block into the bus row of output `name`, keeping the scalar attribute at its last value"""
+        row = self.board.bus[self._output_ports[name], :len(block)]
+        row[:] = block
+        setattr(self, name, float(row[-1]))
+
+    def process_block(self, n: int):
+        """Advance n samples reading input ports and writing output ports as NumPy arrays.
+
+        The default implementation adapts step() by running it once per sample,
+        so patches only need to override this when they have a vectorized path."""
+        bus = self.board.bus
+        inputs = [(k, bus[i, :n].tolist()) for k, i in self._input_ports.items()]
+        outputs = [(k, i, [0.0] * n) for k, i in self._output_ports.items()]
+        self._in_block = True
+        try:
+            for i in range(n):
+                for k, block in inputs:
+                    setattr(self, k, block[i])
+                self.step()
+                for k, _, block in outputs:
+                    block[i] = getattr(self, k)
+        finally:
+            self._in_block = False
+        for _, i, block in outputs:
+            bus[i, :n] = block
+
+    def process_control_block(self, n: int):
+        """Advance n samples running step() only once every board.control_period samples.
+
+        Used by Board.compile() for control-rate patches whose inputs are all
+        control rate too. Control outputs are held and trigger outputs only keep
+        the value on the first sample of each control tick. Outputs read by
+        audio-rate patches while board.interpolate_control is set also get a
+        linearly interpolated copy in their _ramp_ports row."""
+        k = self.board.control_period
+        bus = self.board.bus
+        starts = np.arange(0, n, k)
+        inputs = [(name, bus[i, starts].tolist()) for name, i in self._input_ports.items()]
+        outputs = [(name, i, getattr(self, name), [0.0] * len(starts)) for name, i in self._output_ports.items()]
+        self._in_block = True
+        try:
+            for tick, start in enumerate(starts.tolist()):
+                for name, values in inputs:
+                    setattr(self, name, values[tick])
+                self.step()
+                # step() counted one sample, the tick stands for up to k of them
+                self.time += min(k, n - start) - 1
+                for name, _, _, values in outputs:
+                    values[tick] = getattr(self, name)
+        finally:
+            self._in_block = False
+        for name, i, previous, values in outputs:
+            if name in self._trigger_outputs:
+                block = np.zeros(n)
+                block[starts] = values
+            else:
+                block = np.repeat(values, k)[:n]
+                if name in self._ramp_ports:
+                    # Ramp from the previous tick so each value is reached at the end of its tick
+                    ends = np.minimum(starts + k, n) - 1
+                    bus[self._ramp_ports[name], :n] = np.interp(np.arange(n), np.r_[-1, ends], np.r_[previous, values])
+            bus[i, :n] = block
     
     def connect(patchIn: 'Patch', patchOut: 'Patch', propIn: str, propOut: str):
         print(patchIn,patchOut)
@@ -51,7 +181,11 @@ class Patch(ABC):
         # Use cached metadata for fast validation (O(1) tuple membership test vs dict lookup)
         if propIn in patchIn._io_inputs and propOut in patchOut._io_outputs:
             patchIn.inputs[propIn] = patchOut
+            patchIn.input_ports[propIn] = propOut
             patchOut.outputs[patchIn] = propOut
+            # The graph changed, so any compiled execution plan is stale
+            for board in {patchIn.board, patchOut.board}:
+                if board is not None: board.invalidate()
         else:
             raise UserWarning("Tried to connect input to input or output to output")
     
@@ -89,7 +223,7 @@ class Patch(ABC):
         if patch_ids is not None:
             for input_name, source_patch in self.inputs.items():
                 if source_patch in patch_ids:
-                    source_output = source_patch.outputs.get(self, "")
+                    source_output = self.getSourcePort(input_name)
                     connections[input_name] = {
                         "source_index": patch_ids[source_patch],
                         "source_output": source_output
@@ -0,0 +1,78 @@
+#patches/PolyBLEPOscillator.py
+import numpy as np
+from abc import abstractmethod
+from .Patch import Patch
+
+class PolyBLEPOscillator(Patch):
+    """Base of the band-limited oscillators (saw, square, pulse, triangle).
+
+    Every block the phase (in cycles) is accumulated from the per-sample
+    frequency, like SineGenerator, and subclasses shape it in one vectorized
+    pass. The naive waveform aliases at its discontinuities, so the PolyBLEP
+    residual is subtracted at every jump and PolyBLAMP at every corner."""
+
+    _metadata = {
+        "io": {
+            "frequency": "in",
+            "amplitude": "in",
+            "output": "out"
+        }
+    }
+
+    def __init__(self, frequency:float=440, amplitude:float=0.5):
+        super().__init__()
+        self.frequency = frequency
+        self.amplitude = amplitude
+        self.phase = 0.0
+        self.output = 0.0
+
+    @staticmethod
+    def blep(t, dt):
+        """Residual of a band-limited downward step of 2 at phase 0, two samples wide"""
+        residual = np.zeros_like(t)
+        before = t < dt
+        x = t[before] / dt[before]
+        residual[before] = x + x - x * x - 1.0
+        after = t > 1.0 - dt
+        x = (t[after] - 1.0) / dt[after]
+        residual[after] = x * x + x + x + 1.0
+        return residual
+
+    @staticmethod
+    def blamp(t, dt):
+        """Residual of a band-limited slope change of 2 per sample at phase 0, the integral of blep"""
+        residual = np.zeros_like(t)
+        before = t < dt
+        x = t[before] / dt[before] - 1.0
+        residual[before] = -x * x * x / 3.0
+        after = t > 1.0 - dt
+        x = (t[after] - 1.0) / dt[after] + 1.0
+        residual[after] = x * x * x / 3.0
+        return residual
+
+    @abstractmethod
+    def shape(self, t, dt, inputs):
+        """Band-limited waveform for phases t in [0, 1) with increments dt"""
+        pass
+
+    def render(self, inputs, n: int):
+        increment = inputs["frequency"] / self.board.sample_rate
+        t = np.cumsum(increment)
+        t -= increment
+        t += self.phase
+        self.phase = float((t[-1] + increment[-1]) % 1.0)
+        t %= 1.0
+        # Keep dt away from 0 so the corrections stay finite for silent or negative frequencies
+        dt = np.clip(np.abs(increment), 1e-9, 0.5)
+        return inputs["amplitude"] * self.shape(t, dt, inputs)
+
+    def process_block(self, n: int):
+        inputs = {name: self.getInputBlock(name, n) for name in self._io_inputs}
+        self.setOutputBlock("output", self.render(inputs, n))
+        self.time += n
+
+    def step(self):
+        self.getInputs()
+        inputs = {name: np.array([float(getattr(self, name))]) for name in self._io_inputs}
+        self.output = float(self.render(inputs, 1)[0])
+        self.time += 1
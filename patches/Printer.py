@@ -4,6 +4,7 @@ from .Patch import Patch
 class Printer(Patch):
 
     _metadata = {
+        "sink": True,
         "io": {
             "input":"in",
             "output":"out"
@@ -0,0 +1,26 @@
+#patches/PulseOscillator.py
+import numpy as np
+from .PolyBLEPOscillator import PolyBLEPOscillator
+
+class PulseOscillator(PolyBLEPOscillator):
+    """Band-limited pulse wave (PolyBLEP) with an audio-rate pulse_width, the
+    fraction of the period spent high."""
+
+    _metadata = {
+        "io": {
+            "frequency": "in",
+            "amplitude": "in",
+            "pulse_width": "in",
+            "output": "out"
+        }
+    }
+
+    def __init__(self, frequency:float=440, amplitude:float=0.5, pulse_width:float=0.5):
+        super().__init__(frequency, amplitude)
+        self.pulse_width = pulse_width
+
+    def shape(self, t, dt, inputs):
+        width = np.clip(inputs.get("pulse_width", 0.5), 0.01, 0.99)
+        naive = np.where(t < width, 1.0, -1.0)
+        # Rising edge at phase 0, falling edge at the pulse width
+        return naive + self.blep(t, dt) - self.blep((t - width) % 1.0, dt)
@@ -0,0 +1,120 @@
+#patches/SOSFilter.py
+import math
+import numpy as np
+from scipy.signal import sosfilt
+from .Patch import Patch
+
+class SOSFilter(Patch):
+    """Biquad filter of configurable order, run as second-order sections with scipy's sosfilt.
+
+    mode is one of lowpass, highpass, bandpass, notch, lowshelf, highshelf or
+    peaking (RBJ cookbook biquads). Lowpass and highpass of any order are
+    Butterworth cascades at q=0.707, each section getting its Butterworth Q
+    scaled by q / 0.707, with a first-order section for odd orders. The other
+    modes cascade order // 2 identical sections and need an even order, the
+    shelf and peaking gain being split between them. Blocks are
+    filtered in one sosfilt call with the state carried between blocks, and the
+    coefficients are only recomputed when cutoff, q, gain or mode change.
+    Modulated parameters are taken once per block, at its last sample."""
+
+    _metadata = {
+        "io": {
+            "input": "in",
+            "cutoff": "in",
+            "q": "in",
+            "gain": "in",
+            "output": "out"
+        }
+    }
+
+    modes = ("lowpass", "highpass", "bandpass", "notch", "lowshelf", "highshelf", "peaking")
+
+    def __init__(self, input:float=0.0, cutoff:float=1000.0, q:float=0.707, gain:float=0.0, mode:str="lowpass", order:int=2):
+        super().__init__()
+        if mode not in self.modes: raise ValueError(f"Unknown mode {mode}, expected one of {self.modes}")
+        if order < 1 or (order % 2 and mode not in ("lowpass", "highpass")):
+            raise ValueError(f"Order {order} is not supported for {mode}, lowpass and highpass take any order of at least 1, the other modes an even order")
+        self.input = input
+        self.cutoff = cutoff
+        self.q = q
+        self.gain = gain
+        self.mode = mode
+        self.order = order
+        self.output = 0.0
+        self.sos = None
+        self.zi = None
+        self._sos_key = None
+
+    def sections(self, cutoff, q, gain):
+        """The (sections, 6) second-order sections for the current parameters, cached"""
+        sample_rate = self.board.sample_rate
+        key = (cutoff, q, gain, self.mode, self.order, sample_rate)
+        if key == self._sos_key: return self.sos
+        order = int(self.order)
+        w0 = 2 * math.pi * min(max(cutoff, 1.0), 0.49 * sample_rate) / sample_rate
+        if self.mode in ("lowpass", "highpass"):
+            # Butterworth pole pairs, Q_k = 1 / (2 sin((2k - 1) pi / 2N))
+            qs = [q / math.sqrt(0.5) / (2 * math.sin((2 * k - 1) * math.pi / (2 * order))) for k in range(1, order // 2 + 1)]
+            sections = [self.biquad(w0, section_q, 0.0, 1) for section_q in qs]
+            if order % 2:
+                K = math.tan(w0 / 2)
+                b = [K, K, 0.0] if self.mode == "lowpass" else [1.0, -1.0, 0.0]
+                sections.append(np.array(b + [1 + K, K - 1, 0.0]) / (1 + K))
+        else:
+            count = order // 2
+            sections = [self.biquad(w0, q, gain, count)] * count
+        self.sos = np.array(sections)
+        if self.zi is None or self.zi.shape[0] != len(sections):
+            self.zi = np.zeros((len(sections), 2))
+        self._sos_key = key
+        return self.sos
+
+    def biquad(self, w0, q, gain, count):
+        """One RBJ section of the current mode, with 1 / count of the gain"""
+        cos, alpha = math.cos(w0), math.sin(w0) / (2 * max(q, 1e-3))
+        A = 10 ** (gain / count / 40)
+        root = 2 * math.sqrt(A) * alpha
+        if self.mode == "lowpass":
+            b, a = [(1 - cos) / 2, 1 - cos, (1 - cos) / 2], [1 + alpha, -2 * cos, 1 - alpha]
+        elif self.mode == "highpass":
+            b, a = [(1 + cos) / 2, -(1 + cos), (1 + cos) / 2], [1 + alpha, -2 * cos, 1 - alpha]
+        elif self.mode == "bandpass":
+            b, a = [alpha, 0.0, -alpha], [1 + alpha, -2 * cos, 1 - alpha]
+        elif self.mode == "notch":
+            b, a = [1.0, -2 * cos, 1.0], [1 + alpha, -2 * cos, 1 - alpha]
+        elif self.mode == "peaking":
+            b, a = [1 + alpha * A, -2 * cos, 1 - alpha * A], [1 + alpha / A, -2 * cos, 1 - alpha / A]
+        elif self.mode == "lowshelf":
+            b = [A * ((A + 1) - (A - 1) * cos + root), 2 * A * ((A - 1) - (A + 1) * cos), A * ((A + 1) - (A - 1) * cos - root)]
+            a = [(A + 1) + (A - 1) * cos + root, -2 * ((A - 1) + (A + 1) * cos), (A + 1) + (A - 1) * cos - root]
+        else:
+            b = [A * ((A + 1) + (A - 1) * cos + root), -2 * A * ((A - 1) + (A + 1) * cos), A * ((A + 1) + (A - 1) * cos - root)]
+            a = [(A + 1) - (A - 1) * cos + root, 2 * ((A - 1) - (A + 1) * cos), (A + 1) - (A - 1) * cos - root]
+        return np.array(b + a) / a[0]
+
+    def filter(self, x):
+        """Filter a block with the current coefficients, carrying the state"""
+        sos = self.sections(float(self.cutoff), float(self.q), float(self.gain))
+        y, self.zi = sosfilt(sos, x, zi=self.zi)
+        return y
+
+    def process_block(self, n: int):
+        x = self.getInputBlock("input", n)
+        # getInputBlock leaves connected parameters at the last sample of their block
+        for name in ("cutoff", "q", "gain"):
+            if name in self._input_ports: self.getInputBlock(name, n)
+        self.setOutputBlock("output", self.filter(x))
+        self.time += n
+
+    def step(self):
+        self.getInputs()
+        self.output = float(self.filter(np.array([float(self.input)]))[0])
+        self.time += 1
+
+    def jsonify(self, patch_ids=None, position=None):
+        result = super().jsonify(patch_ids, position)
+        params = result.get("params", {})
+        params["mode"] = self.mode
+        params["order"] = self.order
+        result["params"] = params
+        return result
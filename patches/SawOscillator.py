@@ -0,0 +1,16 @@
+#patches/SawOscillator.py
+from .PolyBLEPOscillator import PolyBLEPOscillator
+
+class SawOscillator(PolyBLEPOscillator):
+    """Band-limited rising sawtooth (PolyBLEP)."""
+
+    _metadata = {
+        "io": {
+            "frequency": "in",
+            "amplitude": "in",
+            "output": "out"
+        }
+    }
+
+    def shape(self, t, dt, inputs):
+        return 2.0 * t - 1.0 - self.blep(t, dt)
@@ -9,6 +9,7 @@ class Scope(VisualPatch):
     """A scope that visualizes input signals"""
     
     _metadata = {
+        "sink": True,
         "io": {
             "x": "in",
             "y": "in",
@@ -16,6 +16,8 @@ class Sequencer(VisualPatch):
     """
 
     _metadata = {
+        "sink": True,
+        "rate": "control",
         "io": {
             "clock": "in",
             "out1": "out",
@@ -3,7 +3,10 @@ import numpy as np
 from .Patch import Patch
 
 class SineGenerator(Patch):
-    """Generates a sine wave that can be connected to other patches."""
+    """Generates a sine wave that can be connected to other patches.
+
+    With wavetable=True blocks read the sine from a lookup table instead of
+    evaluating it, the numba engine always evaluates it."""
     
     _metadata = {
         "io": {
@@ -13,13 +16,26 @@ class SineGenerator(Patch):
             "phase_offset": "in"
         }
     }
+
+    _jit_source = """
+output = amplitude * math.sin(self.phase+phase_offset)
+self.phase = (self.phase + 2 * math.pi * frequency / sample_rate) % (2 * math.pi)
+"""
+
+    _bank_state = ("phase",)
+    _bank_params = ("wavetable",)
+
+    # One period of sine, with the first sample repeated at the end for interpolation
+    table_size = 4096
+    _table = np.sin(2 * np.pi * np.arange(table_size + 1) / table_size)
     
-    def __init__(self, frequency:float=440, amplitude:float=0.5,phase_offset:float=0.0):
+    def __init__(self, frequency:float=440, amplitude:float=0.5,phase_offset:float=0.0,wavetable:bool=False):
         super().__init__()
         self.frequency = frequency
         self.amplitude = amplitude
         self.phase = 0.0
         self.phase_offset = phase_offset
+        self.wavetable = wavetable
         self.output = 0.0
         
     
@@ -34,4 +50,56 @@ class SineGenerator(Patch):
         
         # Update phase, keeping it within [0, 2π)
         self.phase = (self.phase + self.step_size) % (2 * np.pi)
-        self.time += 1
\ No newline at end of file
+        self.time += 1
+
+    @classmethod
+    def render(cls, frequency, amplitude, phase_offset, phase, sample_rate, wavetable=False):
+        """Render (..., n) blocks from per-sample input arrays starting at `phase` (...,).
+
+        The phase of every sample is the running sum of the increments before it,
+        so it stays continuous across blocks and under audio-rate frequency
+        modulation. Where `wavetable` is set the sine is read from a table with
+        linear interpolation instead of calling np.sin. Returns (output, end phase)."""
+        increment = 2 * np.pi * frequency / sample_rate
+        ramp = np.cumsum(increment, axis=-1)
+        ramp -= increment
+        ramp += phase[..., None]
+        end = (ramp[..., -1] + increment[..., -1]) % (2 * np.pi)
+        theta = ramp + phase_offset
+        table = np.asarray(wavetable, dtype=bool)
+        if not table.any():
+            shape = np.sin(theta)
+        elif table.all():
+            shape = cls._lookup(theta)
+        else:
+            shape = np.sin(theta)
+            shape[table] = cls._lookup(theta[table])
+        return amplitude * shape, end
+
+    @classmethod
+    def _lookup(cls, theta):
+        position = theta * (cls.table_size / (2 * np.pi))
+        position %= cls.table_size
+        index = position.astype(np.intp)
+        position -= index
+        low = cls._table[index]
+        return low + position * (cls._table[index + 1] - low)
+
+    def process_block(self, n: int):
+        output, phase = self.render(self.getInputBlock("frequency", n), self.getInputBlock("amplitude", n),
+                                    self.getInputBlock("phase_offset", n), np.float64(self.phase),
+                                    self.board.sample_rate, self.wavetable)
+        self.phase = float(phase)
+        self.setOutputBlock("output", output)
+        self.time += n
+
+    @classmethod
+    def process_bank(cls, inputs, state, n, sample_rate):
+        output, state["phase"][:] = cls.render(inputs["frequency"], inputs["amplitude"], inputs["phase_offset"],
+                                               state["phase"], sample_rate, state["wavetable"])
+        return {"output": output}
+
+    def jsonify(self, patch_ids=None, position=None):
+        result = super().jsonify(patch_ids, position)
+        result.setdefault("params", {})["wavetable"] = self.wavetable
+        return result
@@ -0,0 +1,16 @@
+#patches/SquareOscillator.py
+from .PulseOscillator import PulseOscillator
+
+class SquareOscillator(PulseOscillator):
+    """Band-limited square wave (PolyBLEP), a pulse with a fixed width of one half."""
+
+    _metadata = {
+        "io": {
+            "frequency": "in",
+            "amplitude": "in",
+            "output": "out"
+        }
+    }
+
+    def __init__(self, frequency:float=440, amplitude:float=0.5):
+        super().__init__(frequency, amplitude, 0.5)
@@ -4,6 +4,7 @@ from .Patch import Patch
 class ThreeMix(Patch):
 
     _metadata = {
+        "pure": True,
         "io": {
             "in1":"in",
             "in2":"in",
@@ -12,6 +13,8 @@ class ThreeMix(Patch):
         }
     }
 
+    _jit_source = "output = in1 + in2 + in3"
+
     def __init__(self,in1:float=0.0,in2:float=0.0,in3:float=0.0):
         super().__init__()
         self.in1 = in1
@@ -23,4 +26,8 @@ class ThreeMix(Patch):
         self.getInputs()
         #print(self.input, self.amplification)
         self.output = self.in1 + self.in2 + self.in3
-        self.time+=1
\ No newline at end of file
+        self.time+=1
+
+    def process_block(self, n: int):
+        self.setOutputBlock("output", self.getInputBlock("in1", n) + self.getInputBlock("in2", n) + self.getInputBlock("in3", n))
+        self.time+=n
\ No newline at end of file
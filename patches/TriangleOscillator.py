@@ -0,0 +1,19 @@
+#patches/TriangleOscillator.py
+import numpy as np
+from .PolyBLEPOscillator import PolyBLEPOscillator
+
+class TriangleOscillator(PolyBLEPOscillator):
+    """Band-limited triangle wave (PolyBLAMP)."""
+
+    _metadata = {
+        "io": {
+            "frequency": "in",
+            "amplitude": "in",
+            "output": "out"
+        }
+    }
+
+    def shape(self, t, dt, inputs):
+        naive = 1.0 - 4.0 * np.abs(t - 0.5)
+        # The slope changes by 8 dt per sample at both corners, blamp is scaled for a change of 2
+        return naive + 4.0 * dt * (self.blamp(t, dt) - self.blamp((t + 0.5) % 1.0, dt))
@@ -4,6 +4,7 @@ from .Patch import Patch
 class VCA(Patch):
 
     _metadata = {
+        "pure": True,
         "io": {
             "input":"in",
             "amplification":"in",
@@ -11,6 +12,8 @@ class VCA(Patch):
         }
     }
 
+    _jit_source = "output = input * amplification"
+
     def __init__(self,input:float=0.0,amplification:float=1.0):
         super().__init__()
         self.input = input
@@ -21,4 +24,12 @@ class VCA(Patch):
         self.getInputs()
         #print(self.input, self.amplification)
         self.output = self.input * self.amplification
-        self.time+=1
\ No newline at end of file
+        self.time+=1
+
+    def process_block(self, n: int):
+        self.setOutputBlock("output", self.getInputBlock("input", n) * self.getInputBlock("amplification", n))
+        self.time+=n
+
+    @classmethod
+    def process_bank(cls, inputs, state, n, sample_rate):
+        return {"output": inputs["input"] * inputs["amplification"]}
@@ -1,14 +1,23 @@
 #patches/WavePlayer.py
+import numpy as np
 from .Patch import Patch
 from .waveforms import Waveform
 
 class WavePlayer(Patch):
+    """Plays a waveform once when input or reset goes above zero.
+
+    rate is the number of wave samples advanced per output sample, so 2.0 plays
+    an octave up and negative rates play mirrored around the start. Fractional
+    positions are read with "linear" or "cubic" interpolation. Blocks gather
+    every position between triggers from the wave at once, a connected
+    play_progress falls back to stepping sample by sample."""
 
     _metadata = {
         "io": {
             "input":"in",
             "play_progress":"in",
             "reset":"in",
+            "rate":"in",
             "output":"out"
         },
         "waveio":{
@@ -16,13 +25,18 @@ class WavePlayer(Patch):
         }
     }
 
-    def __init__(self,input:float=0.0,play_progress:float=0.0,reset:float=0.0,wave:Waveform|None=None):
+    interpolations = ("linear", "cubic")
+
+    def __init__(self,input:float=0.0,play_progress:float=0.0,reset:float=0.0,rate:float=1.0,wave:Waveform|None=None,interpolation:str="linear"):
         super().__init__()
+        if interpolation not in self.interpolations: raise ValueError(f"Unknown interpolation {interpolation}, expected one of {self.interpolations}")
         self.wave = wave
         self.play_progress = play_progress
         self.input = input
         self.output = 0.0
         self.reset = reset
+        self.rate = rate
+        self.interpolation = interpolation
         self.playing = False
 
 
@@ -34,11 +48,64 @@ class WavePlayer(Patch):
         if self.input > 0.0:
             self.playing=True
         if self.playing:
-            self.output = self.wave[abs(self.play_progress)]
+            if self.interpolation == "linear":
+                self.output = self.wave[abs(self.play_progress)]
+            else:
+                self.output = float(self.wave.gather([abs(self.play_progress)], self.interpolation)[0])
             #print(self.play_progress,self.output,len(self.wave))
-            self.play_progress+=1
+            self.play_progress+=self.rate
             if self.play_progress > len(self.wave):
                 self.output=0.0
                 self.playing=False
                 self.play_progress = 0
-        self.time+=1
\ No newline at end of file
+        self.time+=1
+
+    def process_block(self, n: int):
+        if self.wave is None or "play_progress" in self._input_ports:
+            return super().process_block(n)
+        trigger = self.getInputBlock("input", n) > 0.0
+        reset = self.getInputBlock("reset", n) > 0.0
+        rate = self.getInputBlock("rate", n)
+        length = len(self.wave)
+        output = np.empty(n)
+        resets = np.flatnonzero(reset)
+        starts = np.flatnonzero(trigger | reset)
+        i = 0
+        while i < n:
+            if not self.playing:
+                # Hold the last output until the next trigger
+                start = starts[np.searchsorted(starts, i)] if starts.size and starts[-1] >= i else n
+                output[i:start] = self.output
+                self.playing = start < n
+                i = start
+                continue
+            if reset[i]: self.play_progress = 0
+            # Play until the next reset restarts the wave
+            later = np.searchsorted(resets, i, side="right")
+            end = resets[later] if later < resets.size else n
+            after = self.play_progress + np.cumsum(rate[i:end])
+            positions = np.concatenate(([self.play_progress], after[:-1]))
+            over = np.flatnonzero(after > length)
+            if over.size:
+                # The wave ran out, the sample reaching the end outputs 0 like step()
+                stop = over[0]
+                output[i:i + stop] = self.wave.gather(np.abs(positions[:stop]), self.interpolation)
+                output[i + stop] = 0.0
+                self.output = 0.0
+                self.playing = False
+                self.play_progress = 0
+                i += stop + 1
+                continue
+            output[i:end] = self.wave.gather(np.abs(positions), self.interpolation)
+            self.output = float(output[end - 1])
+            self.play_progress = float(after[-1])
+            i = end
+        self.setOutputBlock("output", output)
+        self.time += n
+
+    def jsonify(self, patch_ids=None, position=None):
+        result = super().jsonify(patch_ids, position)
+        params = result.get("params", {})
+        params["interpolation"] = self.interpolation
+        result["params"] = params
+        return result
@@ -28,6 +28,11 @@ from .Map import Map
 from .MajorQuantitizer import MajorQuantitizer
 from .ClockedSample import ClockedSample
 from .WalkingNoise import WalkingNoise
+from .SawOscillator import SawOscillator
+from .SquareOscillator import SquareOscillator
+from .PulseOscillator import PulseOscillator
+from .TriangleOscillator import TriangleOscillator
+from .SOSFilter import SOSFilter
 
 
 __all__ = ["Patch",
@@ -58,5 +63,10 @@ __all__ = ["Patch",
            "MajorQuantitizer",
            "ClockedSample",
            "WalkingNoise",
-           "Sequencer"
+           "Sequencer",
+           "SawOscillator",
+           "SquareOscillator",
+           "PulseOscillator",
+           "TriangleOscillator",
+           "SOSFilter"
            ]
\ No newline at end of file
@@ -0,0 +1,75 @@
+#patches/waveforms/DecodeCache.py
+import hashlib
+import os
+import numpy as np
+
+try:
+    from platformdirs import user_cache_dir
+except ImportError:
+    user_cache_dir = None
+
+class DecodeCache:
+    """On-disk cache of decoded, resampled audio as .npy files.
+
+    Entries are keyed by the absolute path, modification time and size of the
+    source file and the target sample rate, so editing the file or changing the
+    rate misses. Hits are memory-mapped read-only, which makes reloading a board
+    near instant without copying the audio. Entries are evicted least recently
+    used first once the cache grows past max_bytes."""
+
+    def __init__(self, directory: str | None = None, max_bytes: int = 2 << 30):
+        if directory is None:
+            directory = user_cache_dir("NewSynth") if user_cache_dir is not None else os.path.join(os.path.expanduser("~"), ".cache", "NewSynth")
+            directory = os.path.join(directory, "decoded")
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def path(self, filename: str, sample_rate: int):
+        stat = os.stat(filename)
+        key = f"{os.path.abspath(filename)}|{stat.st_mtime_ns}|{stat.st_size}|{sample_rate}"
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + ".npy")
+
+    def load(self, filename: str, sample_rate: int):
+        """Return the cached audio as a read-only memory map, or None on a miss"""
+        try:
+            path = self.path(filename, sample_rate)
+            data = np.load(path, mmap_mode="r")
+            # The modification time orders entries for eviction
+            os.utime(path)
+            return data
+        except (OSError, ValueError):
+            return None
+
+    def store(self, filename: str, sample_rate: int, data):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self.path(filename, sample_rate)
+            # Write aside and rename, so a concurrent load never sees a partial file
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, "wb") as f:
+                np.save(f, np.asarray(data, dtype=np.float32))
+            os.replace(temporary, path)
+            self.evict()
+        except OSError as e:
+            print(f"Warning: could not cache decoded audio: {e}")
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".npy"):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes: break
+            try:
+                os.remove(os.path.join(self.directory, name))
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith(".npy"): os.remove(os.path.join(self.directory, name))
@@ -0,0 +1,59 @@
+#patches/waveforms/DecodedStreamReader.py
+import math
+import threading
+import numpy as np
+import soundfile as sf
+from .StreamReader import StreamReader
+
+try:
+    import soxr
+except ImportError:
+    soxr = None
+
+class DecodedStreamReader(StreamReader):
+    """Streams a compressed (or non-mappable) audio file, decoding and resampling it chunk by chunk.
+
+    Each chunk is decoded from a source range aligned so that it starts on a
+    whole target sample, with `padding` extra source frames on both sides so
+    the resampler has no edge effects where chunks meet."""
+
+    padding = 256
+
+    def __init__(self, filename: str, sample_rate: int, window: int = 4):
+        self.filename = filename
+        self.sample_rate = sample_rate
+        self.file = sf.SoundFile(filename)
+        self.source_rate = self.file.samplerate
+        g = math.gcd(sample_rate, self.source_rate)
+        # Source frames and target samples of the shortest span mapping whole samples to whole samples
+        self.source_step = self.source_rate // g
+        self.target_step = sample_rate // g
+        self._lock = threading.Lock()
+        super().__init__(math.ceil(self.file.frames * sample_rate / self.source_rate), window)
+
+    def _decode(self, k: int):
+        start = k * self.chunk_size
+        stop = min(start + self.chunk_size, self.length)
+        # First source frame of the aligned span holding start, moved back by at least the padding
+        span = start // self.target_step - math.ceil(self.padding / self.source_step)
+        begin = max(0, span) * self.source_step
+        end = min(self.file.frames, math.ceil(stop * self.source_rate / self.sample_rate) + self.padding)
+        with self._lock:
+            self.file.seek(begin)
+            data = self.file.read(end - begin, dtype="float32", always_2d=True).mean(axis=1, dtype=np.float32)
+        if self.source_rate != self.sample_rate:
+            if soxr is not None:
+                data = soxr.resample(data, self.source_rate, self.sample_rate)
+            else:
+                from scipy.signal import resample_poly
+                data = resample_poly(data, self.target_step, self.source_step).astype(np.float32)
+        offset = start - begin * self.sample_rate // self.source_rate
+        chunk = data[offset:offset + stop - start]
+        if len(chunk) < stop - start:
+            chunk = np.concatenate([chunk, np.zeros(stop - start - len(chunk), dtype=np.float32)])
+        return chunk
+
+    def close(self):
+        super().close()
+        with self._lock:
+            self.file.close()
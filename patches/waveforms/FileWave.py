@@ -1,25 +1,56 @@
 #patches/waveforms/FileWave.py
+import os
 import librosa
 import numpy as np
 from .Waveform import Waveform
+from .MappedWavReader import MappedWavReader
+from .DecodedStreamReader import DecodedStreamReader
+from .DecodeCache import DecodeCache
+from .WaveformRegistry import WaveformRegistry
 
 class FileWave(Waveform):
-    def __init__(self, filename: str, sample_rate: int = 22050):
-        # Load audio file using librosa
-        y, sr = librosa.load(filename, sr=sample_rate, mono=True)
-        
+    """Waveform read from an audio file.
+
+    By default the whole file is decoded into memory. With streaming=True,
+    audio_data is a StreamReader instead: uncompressed WAV files at the target
+    sample rate are memory-mapped, other files are decoded and resampled in
+    chunks, and a background thread keeps a window ahead of the read head.
+
+    Decoded audio is kept in FileWave.cache (set it to None to disable), and a
+    cached file is memory-mapped in either mode instead of being decoded again.
+    FileWaves with the same definition share one buffer through WaveformRegistry."""
+
+    cache = DecodeCache()
+
+    def __init__(self, filename: str, sample_rate: int = 22050, streaming: bool = False):
+        self.streaming = streaming
+        key = (os.path.abspath(filename), sample_rate, streaming)
+        self.audio_data = WaveformRegistry.acquire(key, lambda: self._load(filename, sample_rate, streaming))
+
         # Calculate duration based on loaded audio
-        duration = len(y) / sr
+        duration = len(self.audio_data) / sample_rate
         print(duration)
         # Initialize the Waveform with the correct duration and sample rate
-        super().__init__(duration=duration, sample_rate=sr)
+        super().__init__(duration=duration, sample_rate=sample_rate)
         
-        # Store the normalized audio data and filename
-        self.audio_data = y.astype(np.float32)
+        # Store the filename
         self.filename = filename
 
         print(len(self))
         
+    def _load(self, filename: str, sample_rate: int, streaming: bool):
+        cached = self.cache.load(filename, sample_rate) if self.cache is not None else None
+        if cached is not None:
+            return cached
+        if streaming:
+            reader = MappedWavReader.probe(filename, sample_rate)
+            return reader if reader is not None else DecodedStreamReader(filename, sample_rate)
+        # Load audio file using librosa
+        y, _ = librosa.load(filename, sr=sample_rate, mono=True)
+        y = y.astype(np.float32)
+        if self.cache is not None: self.cache.store(filename, sample_rate, y)
+        return y
+
     def getSample(self, normTime: float):
         # Clamp normalized time between 0 and 1
         normTime = max(0.0, min(1.0, normTime))
@@ -37,8 +68,23 @@ class FileWave(Waveform):
         else:
             return self.audio_data[index]
     
+    def gather(self, positions, interpolation: str = "linear"):
+        """Vectorized getSample for a block of positions, reading one slice of audio_data"""
+        data = self.audio_data
+        last = len(data) - 1
+        # Same mapping as getSample: position -> normalized time -> index into audio_data
+        exact = np.clip(np.asarray(positions, dtype=np.float64) / len(self), 0.0, 1.0) * last
+        if exact.size == 0: return exact
+        # A streaming reader only takes slices, so read the span covering the block once.
+        # It reaches every neighbour the interpolation needs, so clamping to it
+        # is the same as clamping to audio_data
+        start = max(int(exact.min()) - 1, 0)
+        window = np.asarray(data[start:min(int(exact.max()) + 3, last + 1)])
+        return self.interpolate(window, exact - start, interpolation)
+
     def jsonify(self, position=None):
         """Convert the FileWave to a JSON-serializable format"""
         data = super().jsonify(position)
         data["filename"] = self.filename
-        return data
\ No newline at end of file
+        data["streaming"] = self.streaming
+        return data
@@ -1,23 +1,62 @@
 #patches/waveforms/FunctionWave.py
 from .Waveform import Waveform
 import inspect
+import numpy as np
 
 class FunctionWave(Waveform):
+    """Waveform defined by a function of the normalized time in [0, 1].
 
-    def __init__(self,func, duration:float = 1.0, sample_rate:int = 22050):
+    With prerender=True the function is evaluated once on construction into a
+    float32 table of `resolution` points (len(self) by default), and samples
+    are interpolated from the table instead of calling the function."""
+
+    def __init__(self,func, duration:float = 1.0, sample_rate:int = 22050, prerender:bool = False, resolution:int|None = None):
         super().__init__(duration, sample_rate)
         self.func = func
+        self.prerender = prerender
+        self.resolution = resolution
+        self.table = None
         # Store the function source code if possible
         try:
             self.func_source = inspect.getsource(func)
         except:
             self.func_source = None
+        if prerender:
+            self.render()
+
+    def render(self):
+        """Evaluate the function into self.table"""
+        size = max(2, int(self.resolution or len(self)))
+        times = np.linspace(0.0, 1.0, size)
+        try:
+            # Most envelopes are plain arithmetic and accept the whole array at once
+            table = np.broadcast_to(np.asarray(self.func(times), dtype=np.float32), times.shape)
+        except Exception:
+            table = np.array([self.func(t) for t in times.tolist()], dtype=np.float32)
+        self.table = np.array(table)
+        self.table.flags.writeable = False
+        return self.table
 
     def getSample(self, normTime):
-        return self.func(normTime)
+        if self.table is None:
+            return self.func(normTime)
+        exact = min(max(normTime, 0.0), 1.0) * (len(self.table) - 1)
+        index = int(exact)
+        if index >= len(self.table) - 1:
+            return float(self.table[-1])
+        frac = exact - index
+        return float(self.table[index] + frac * (self.table[index + 1] - self.table[index]))
+
+    def gather(self, positions, interpolation: str = "linear"):
+        if self.table is None:
+            return super().gather(positions, interpolation)
+        normTime = np.clip(np.asarray(positions, dtype=np.float64) / len(self), 0.0, 1.0)
+        return self.interpolate(self.table, normTime * (len(self.table) - 1), interpolation)
     
     def jsonify(self, position=None):
         """Convert the FunctionWave to a JSON-serializable format"""
         data = super().jsonify(position)
         data["func_source"] = self.func_source
-        return data
\ No newline at end of file
+        data["prerender"] = self.prerender
+        data["resolution"] = self.resolution
+        return data
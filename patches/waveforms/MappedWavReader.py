@@ -0,0 +1,55 @@
+#patches/waveforms/MappedWavReader.py
+import struct
+import numpy as np
+from .StreamReader import StreamReader
+
+class MappedWavReader(StreamReader):
+    """Streams an uncompressed WAV file through a memory map of its data chunk.
+
+    Only 8, 16 and 32-bit PCM and 32/64-bit float files already at the target
+    sample rate can be mapped, see probe(). Channels are mixed to mono per chunk."""
+
+    _formats = {(1, 8): np.uint8, (1, 16): np.int16, (1, 32): np.int32, (3, 32): np.float32, (3, 64): np.float64}
+
+    def __init__(self, filename: str, offset: int, frames: int, channels: int, dtype, window: int = 4):
+        self.filename = filename
+        self.frames = np.memmap(filename, dtype=np.dtype(dtype).newbyteorder("<"), mode="r", offset=offset, shape=(frames, channels))
+        super().__init__(frames, window)
+
+    @classmethod
+    def probe(cls, filename: str, sample_rate: int):
+        """Return a reader for `filename`, or None if it is not a mappable WAV at sample_rate"""
+        try:
+            with open(filename, "rb") as f:
+                riff, _, wave = struct.unpack("<4sI4s", f.read(12))
+                if riff != b"RIFF" or wave != b"WAVE": return None
+                fmt = None
+                while True:
+                    header = f.read(8)
+                    if len(header) < 8: return None
+                    chunk, size = struct.unpack("<4sI", header)
+                    if chunk == b"fmt ":
+                        fmt = f.read(size)
+                    elif chunk == b"data":
+                        if fmt is None: return None
+                        tag, channels, rate, _, align, bits = struct.unpack("<HHIIHH", fmt[:16])
+                        if tag == 0xFFFE and len(fmt) >= 26:
+                            # WAVE_FORMAT_EXTENSIBLE, the real tag starts the subformat GUID
+                            tag = struct.unpack("<H", fmt[24:26])[0]
+                        dtype = cls._formats.get((tag, bits))
+                        if dtype is None or rate != sample_rate: return None
+                        return cls(filename, f.tell(), size // align, channels, dtype)
+                    else:
+                        f.seek(size + (size & 1), 1)
+        except (OSError, struct.error):
+            return None
+
+    def _decode(self, k: int):
+        frames = self.frames[k * self.chunk_size:(k + 1) * self.chunk_size]
+        if frames.dtype.kind == "u":
+            block = (frames.astype(np.float32) - 128.0) / 128.0
+        elif frames.dtype.kind == "i":
+            block = frames.astype(np.float32) / float(np.iinfo(frames.dtype).max + 1)
+        else:
+            block = frames.astype(np.float32)
+        return block.mean(axis=1, dtype=np.float32)
@@ -0,0 +1,80 @@
+#patches/waveforms/StreamReader.py
+import threading
+import weakref
+from abc import ABC, abstractmethod
+import numpy as np
+
+class StreamReader(ABC):
+    """Random access to a long recording without holding it decoded in memory.
+
+    Behaves like a read-only float32 array (len() and indexing by int or
+    slice). Samples are decoded in chunks of chunk_size on first access, and a
+    background thread keeps the `window` chunks ahead of the last one read
+    decoded, dropping those behind it. Subclasses implement _decode(k), which
+    returns chunk k at the target sample rate."""
+
+    chunk_size = 1 << 16
+
+    def __init__(self, length: int, window: int = 4):
+        self.length = length
+        self.window = window
+        self.chunks = {}
+        self.head = 0
+        self.closed = False
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=StreamReader._prefetch, args=(weakref.ref(self), self._wake), daemon=True)
+        self._thread.start()
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.length)
+            if start >= stop: return np.zeros(0, dtype=np.float32)
+            size = self.chunk_size
+            parts = [self._chunk(k) for k in range(start // size, (stop - 1) // size + 1)]
+            offset = (start // size) * size
+            return np.concatenate(parts)[start - offset:stop - offset:step]
+        index = int(index)
+        if index < 0: index += self.length
+        if not 0 <= index < self.length: raise IndexError("StreamReader index out of range")
+        k = index // self.chunk_size
+        chunk = self.chunks.get(k)
+        if chunk is None or k != self.head: chunk = self._chunk(k)
+        return chunk[index - k * self.chunk_size]
+
+    def _chunk(self, k: int):
+        chunk = self.chunks.get(k)
+        if chunk is None:
+            chunk = self.chunks[k] = self._decode(k)
+        if k != self.head:
+            self.head = k
+            self._wake.set()
+        return chunk
+
+    @abstractmethod
+    def _decode(self, k: int):
+        """Chunk k at the target sample rate as a float32 array"""
+        pass
+
+    def close(self):
+        self.closed = True
+        self._wake.set()
+
+    @staticmethod
+    def _prefetch(ref, wake):
+        # Only holds a weak reference between rounds, so the reader can be collected
+        while True:
+            wake.wait(1.0)
+            wake.clear()
+            reader = ref()
+            if reader is None or reader.closed: return
+            head = reader.head
+            last = min(head + reader.window, (reader.length - 1) // reader.chunk_size)
+            for k in list(reader.chunks):
+                if k < head - 1 or k > last: reader.chunks.pop(k, None)
+            for k in range(head, last + 1):
+                if reader.closed or reader.head != head: break
+                if k not in reader.chunks: reader.chunks[k] = reader._decode(k)
+            del reader
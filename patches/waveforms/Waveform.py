@@ -1,6 +1,7 @@
 #patches/waveforms/Waveform.py
 from abc import ABC, abstractmethod
 import json
+import numpy as np
 
 class Waveform(ABC):
 
@@ -16,6 +17,43 @@ class Waveform(ABC):
     def __getitem__(self,i):
         return self.getSample(i/len(self))
     
+    def gather(self, positions, interpolation: str = "linear"):
+        """Return the samples at fractional `positions` (indices like __getitem__) as an array.
+
+        "linear" matches __getitem__, "cubic" interpolates the integer samples
+        around each position with a Catmull-Rom spline. This default looks up
+        every sample through __getitem__, waveforms backed by an array override
+        it with a vectorized gather."""
+        positions = np.asarray(positions, dtype=np.float64)
+        if interpolation == "cubic":
+            index = np.floor(positions).astype(np.int64)
+            last = len(self) - 1
+            points = [np.array([self[i] for i in np.clip(index + k, 0, last).tolist()], dtype=np.float64) for k in (-1, 0, 1, 2)]
+            return self.catmull_rom(*points, positions - index)
+        return np.array([self[p] for p in positions.tolist()], dtype=np.float64)
+
+    @classmethod
+    def interpolate(cls, table, exact, interpolation: str = "linear"):
+        """Read `table` at the fractional indices `exact`, clamping at both ends"""
+        index = exact.astype(np.int64)
+        frac = exact - index
+        last = len(table) - 1
+
+        def at(k):
+            return table[np.clip(index + k, 0, last)].astype(np.float64)
+
+        if interpolation == "cubic":
+            return cls.catmull_rom(at(-1), at(0), at(1), at(2), frac)
+        return at(0) + frac * (at(1) - at(0))
+
+    @staticmethod
+    def catmull_rom(y0, y1, y2, y3, frac):
+        """Cubic interpolation between y1 and y2 at frac in [0, 1)"""
+        a = -0.5 * y0 + 1.5 * y1 - 1.5 * y2 + 0.5 * y3
+        b = y0 - 2.5 * y1 + 2 * y2 - 0.5 * y3
+        c = -0.5 * y0 + 0.5 * y2
+        return ((a * frac + b) * frac + c) * frac + y1
+
     def __len__(self):
         return int((self.sample_rate)*self.duration)
     
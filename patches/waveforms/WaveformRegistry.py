@@ -0,0 +1,31 @@
+#patches/waveforms/WaveformRegistry.py
+import threading
+import weakref
+
+class WaveformRegistry:
+    """Process-wide table of the decoded audio buffers behind FileWaves.
+
+    FileWaves with the same definition (file, sample rate and mode) share one
+    read-only buffer, whatever board or WavePlayer they belong to. Entries are
+    weak references, so a buffer lives exactly as long as some FileWave still
+    holds it and memory scales with unique samples, not with voices."""
+
+    _buffers = weakref.WeakValueDictionary()
+    _lock = threading.Lock()
+
+    @classmethod
+    def acquire(cls, key, load):
+        """Return the buffer registered under key, calling load() to create it on first use"""
+        with cls._lock:
+            buffer = cls._buffers.get(key)
+            if buffer is None:
+                buffer = load()
+                if getattr(buffer, "flags", None) is not None and buffer.flags.writeable:
+                    buffer.flags.writeable = False
+                cls._buffers[key] = buffer
+            return buffer
+
+    @classmethod
+    def keys(cls):
+        with cls._lock:
+            return list(cls._buffers.keys())
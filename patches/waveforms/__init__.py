@@ -2,5 +2,7 @@
 from .Waveform import Waveform
 from .FunctionWave import FunctionWave
 from .FileWave import FileWave
+from .DecodeCache import DecodeCache
+from .WaveformRegistry import WaveformRegistry
 
-__all__ = ["Waveform","FunctionWave","FileWave"]
\ No newline at end of file
+__all__ = ["Waveform","FunctionWave","FileWave","DecodeCache","WaveformRegistry"]
\ No newline at end of file